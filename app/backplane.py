@@ -0,0 +1,353 @@
+"""Fan-out backplane — shares relay frames between uvicorn workers / nodes.
+
+Whichever worker holds the relay socket publishes every frame here; every
+worker (including the publisher) receives it, applies it to its own
+``SRCache`` and fans out to its own browsers. Frames carry a backplane-wide
+sequence number that the snapshot store uses as its version, so all workers
+agree on the version of a given topic state.
+
+Implementations:
+- ``InProcessBackplane`` — single worker, frames are handed straight back.
+- ``RedisBackplane``     — Redis pub/sub over a minimal RESP client (TCP or
+                           unix socket). Also keeps the latest frame per key in
+                           a hash so a freshly started worker can hydrate; the
+                           relay-owning worker prunes games that left the slate.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import secrets
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+
+log = logging.getLogger("backplane")
+
+RelayHandler = Callable[[int, str], Awaitable[None]]
+ControlHandler = Callable[[str], Awaitable[None]]
+ResetHandler = Callable[[], None]
+
+# Sequence, latest-frame hash and publish in one atomic round trip
+_PUBLISH_LUA = """
+local seq = redis.call('INCR', KEYS[1])
+local frame = seq .. ' ' .. ARGV[2]
+redis.call('HSET', KEYS[2], ARGV[1], frame)
+redis.call('PUBLISH', ARGV[3], frame)
+return seq
+"""
+_HDEL_BATCH = 500
+
+_TYPE_RE = re.compile(r'"type"\s*:\s*"([^"]+)"')
+_KEY_RE = re.compile(r'"(?:sport|game_id)"\s*:\s*"([^"]+)"')
+
+
+def relay_frame_key(raw: str) -> str | None:
+    """Identify which piece of state a relay frame replaces, e.g. ``summary:<game_id>``.
+
+    Only sniffs the head of the frame — the relay writes ``type`` and
+    ``sport``/``game_id`` before ``data`` — and falls back to a full parse.
+    """
+    head = raw[:256]
+    m_type = _TYPE_RE.search(head)
+    m_key = _KEY_RE.search(head)
+    if m_type and m_key:
+        return f"{m_type.group(1)}:{m_key.group(1)}"
+    try:
+        msg = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    key = msg.get("sport") or msg.get("game_id")
+    if not msg.get("type") or not key:
+        return None
+    return f"{msg['type']}:{key}"
+
+
+class Backplane(ABC):
+    # Names one run of the sequence; set by ``start``. Versions only compare within an epoch.
+    epoch = ""
+
+    async def start(self, on_relay: RelayHandler, on_control: ControlHandler,
+                    on_reset: ResetHandler | None = None):
+        """``on_reset`` runs when the sequence starts over (a new epoch); versions seen so far are void."""
+        self._on_relay = on_relay
+        self._on_control = on_control
+        self._on_reset = on_reset
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish_relay(self, raw: str):
+        """Publish a relay frame to every worker."""
+
+    @abstractmethod
+    async def publish_control(self, raw: str):
+        """Publish a control message (e.g. a PBP request) for the relay-owning worker."""
+
+    async def prune(self, keep: Callable[[str], bool]) -> int:
+        """Forget retained state for frame keys ``keep`` rejects. Returns how many were dropped."""
+        return 0
+
+    def stats(self) -> dict:
+        return {"kind": self.kind}
+
+
+class InProcessBackplane(Backplane):
+    kind = "memory"
+
+    def __init__(self):
+        self._seq = 0
+        self.epoch = secrets.token_hex(6)  # the sequence restarts with the process
+
+    async def publish_relay(self, raw: str):
+        self._seq += 1
+        await self._on_relay(self._seq, raw)
+
+    async def publish_control(self, raw: str):
+        await self._on_control(raw)
+
+    def stats(self) -> dict:
+        return {"kind": self.kind, "seq": self._seq}
+
+
+# ── Minimal RESP2 client ─────────────────────────────────────────────
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """Just enough of the Redis protocol for pub/sub + a couple of commands."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, url: str) -> "RespConnection":
+        parsed = urlparse(url)
+        if parsed.scheme == "unix":
+            reader, writer = await asyncio.open_unix_connection(parsed.path)
+        else:
+            reader, writer = await asyncio.open_connection(parsed.hostname or "localhost", parsed.port or 6379)
+        conn = cls(reader, writer)
+        if parsed.password:
+            await conn.command("AUTH", parsed.password)
+        db = parsed.path.lstrip("/") if parsed.scheme != "unix" else ""
+        if db and db != "0":
+            await conn.command("SELECT", db)
+        return conn
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    async def read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("backplane connection closed")
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b"+":
+            return rest.decode()
+        if prefix == b"-":
+            raise RespError(rest.decode())
+        if prefix == b":":
+            return int(rest)
+        if prefix == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = await self._reader.readexactly(size + 2)
+            return data[:-2].decode()
+        if prefix == b"*":
+            size = int(rest)
+            if size < 0:
+                return None
+            return [await self.read_reply() for _ in range(size)]
+        raise RespError(f"unexpected reply {line!r}")
+
+    async def send(self, *args):
+        self._writer.write(self._encode(*args))
+        await self._writer.drain()
+
+    async def command(self, *args):
+        async with self._lock:
+            await self.send(*args)
+            return await self.read_reply()
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+class RedisBackplane(Backplane):
+    kind = "redis"
+
+    def __init__(self, url: str, prefix: str = "lsl", start_timeout: float = 10.0):
+        self.url = url
+        self.start_timeout = start_timeout
+        self._relay_channel = f"{prefix}:relay"
+        self._control_channel = f"{prefix}:control"
+        self._seq_key = f"{prefix}:seq"
+        self._state_key = f"{prefix}:state"
+        self._epoch_key = f"{prefix}:epoch"
+        self._cmd: RespConnection | None = None
+        self._reconnect_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.pruned = 0
+        # Highest sequence applied, so a resubscribe only replays what was missed
+        self._applied = 0
+
+    def _where(self) -> str:
+        parsed = urlparse(self.url)
+        return parsed.path if parsed.scheme == "unix" else f"{parsed.hostname or 'localhost'}:{parsed.port or 6379}"
+
+    async def start(self, on_relay: RelayHandler, on_control: ControlHandler,
+                    on_reset: ResetHandler | None = None):
+        await super().start(on_relay, on_control, on_reset)
+        try:
+            self._cmd = await asyncio.wait_for(RespConnection.open(self.url), self.start_timeout)
+            self._task = asyncio.create_task(self._listen())
+            await asyncio.wait_for(self._ready.wait(), self.start_timeout)
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            await self.stop()
+            raise ConnectionError(
+                f"Redis backplane at {self._where()} not ready after {self.start_timeout:.0f}s: "
+                f"{e or 'timed out'}"
+            ) from e
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._cmd:
+            await self._cmd.close()
+
+    async def _command(self, *args):
+        """Run a command, reopening the connection once if Redis went away (restart, network blip)."""
+        conn = self._cmd
+        try:
+            return await conn.command(*args)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            async with self._reconnect_lock:
+                if self._cmd is conn:  # nobody reopened it while we waited
+                    log.warning("Backplane connection lost (%s) — reconnecting", e or type(e).__name__)
+                    await conn.close()
+                    self._cmd = await RespConnection.open(self.url)
+            return await self._cmd.command(*args)
+
+    async def publish_relay(self, raw: str):
+        key = relay_frame_key(raw)
+        if key is None:
+            return  # heartbeats and junk stay local to the receiving worker
+        await self._command("EVAL", _PUBLISH_LUA, 2, self._seq_key, self._state_key,
+                                key, raw, self._relay_channel)
+        self.published += 1
+
+    async def publish_control(self, raw: str):
+        await self._command("PUBLISH", self._control_channel, raw)
+
+    async def prune(self, keep: Callable[[str], bool]) -> int:
+        fields = await self._command("HKEYS", self._state_key) or []
+        stale = [f for f in fields if not keep(f)]
+        for i in range(0, len(stale), _HDEL_BATCH):
+            await self._command("HDEL", self._state_key, *stale[i:i + _HDEL_BATCH])
+        self.pruned += len(stale)
+        return len(stale)
+
+    async def _sync_epoch(self):
+        """Adopt the shared epoch; a new one means Redis lost the sequence and it restarted at 1."""
+        # Shared by every worker; only a Redis that lost its data makes a new one
+        await self._command("SET", self._epoch_key, secrets.token_hex(6), "NX")
+        epoch = await self._command("GET", self._epoch_key)
+        if epoch == self.epoch:
+            return
+        if self.epoch:
+            log.warning("Backplane epoch changed (%s -> %s) — sequence restarted", self.epoch, epoch)
+            self._applied = 0
+            if self._on_reset is not None:
+                self._on_reset()
+        self.epoch = epoch
+
+    async def _hydrate(self) -> int:
+        """Replay the latest frame for every key not applied yet. Returns the highest sequence seen."""
+        reply = await self._command("HGETALL", self._state_key) or []
+        frames = []
+        for frame in reply[1::2]:
+            seq, _, raw = frame.partition(" ")
+            if int(seq) > self._applied:
+                frames.append((int(seq), raw))
+        frames.sort()
+        for seq, raw in frames:
+            await self._on_relay(seq, raw)
+        if frames:
+            self._applied = frames[-1][0]
+            log.info("Backplane hydrated %d entries (seq %d)", len(frames), frames[-1][0])
+        return self._applied
+
+    async def _listen(self):
+        while True:
+            sub = None
+            try:
+                sub = await RespConnection.open(self.url)
+                await sub.send("SUBSCRIBE", self._relay_channel, self._control_channel)
+                for _ in range(2):
+                    await sub.read_reply()
+                # Subscribed first, then hydrate: anything published meanwhile
+                # is either in the hash already (seq <= floor) or delivered below.
+                await self._sync_epoch()
+                floor = await self._hydrate()
+                self._ready.set()
+                while True:
+                    kind, channel, data = await sub.read_reply()
+                    if kind != "message":
+                        continue
+                    if channel == self._relay_channel:
+                        seq, _, raw = data.partition(" ")
+                        if int(seq) <= floor:
+                            continue
+                        self.received += 1
+                        self._applied = int(seq)
+                        await self._on_relay(int(seq), raw)
+                    elif channel == self._control_channel:
+                        await self._on_control(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("Backplane subscriber error: %s — reconnecting in 1s", e)
+                await asyncio.sleep(1.0)
+            finally:
+                if sub is not None:
+                    await sub.close()
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "published": self.published,
+            "received": self.received,
+            "pruned": self.pruned,
+        }
+
+
+def create_backplane(kind: str, url: str = "", prefix: str = "lsl",
+                     start_timeout: float = 10.0) -> Backplane:
+    if kind == "redis":
+        return RedisBackplane(url, prefix, start_timeout)
+    return InProcessBackplane()
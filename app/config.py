@@ -16,5 +16,62 @@ SR_SCHEDULE_INTERVAL = int(os.getenv("SR_SCHEDULE_INTERVAL", "300"))  # seconds
 SR_GAME_INTERVAL = int(os.getenv("SR_GAME_INTERVAL", "120"))  # seconds between live game polls
 SR_DAILY_QUOTA = int(os.getenv("SR_DAILY_QUOTA", "1000"))
 
+# SR cache bounds (sizes are JSON bytes; idle TTLs in seconds)
+SR_CACHE_MAX_BYTES = int(os.getenv("SR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+SR_CACHE_SUMMARY_FINAL_TTL = float(os.getenv("SR_CACHE_SUMMARY_FINAL_TTL", str(6 * 3600)))
+SR_CACHE_PBP_TTL = float(os.getenv("SR_CACHE_PBP_TTL", str(2 * 3600)))
+SR_CACHE_PBP_FINAL_TTL = float(os.getenv("SR_CACHE_PBP_FINAL_TTL", "900"))
+SR_CACHE_SWEEP_INTERVAL = float(os.getenv("SR_CACHE_SWEEP_INTERVAL", "60"))
+
+# Warm-start snapshot of the SR cache (sportradar mode only)
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "")  # default: <tmp>/lsl-cache.sqlite; "off" disables
+CACHE_SNAPSHOT_INTERVAL = float(os.getenv("CACHE_SNAPSHOT_INTERVAL", "30"))  # seconds, skipped if unchanged
+CACHE_SNAPSHOT_MAX_AGE = float(os.getenv("CACHE_SNAPSHOT_MAX_AGE", str(12 * 3600)))  # older snapshots are ignored
+
 # WebSocket relay
 RELAY_SECRET = os.getenv("RELAY_SECRET", "")
+
+# Realtime pipeline (relay ingest → browser fan-out)
+RELAY_INGEST_QUEUE_SIZE = int(os.getenv("RELAY_INGEST_QUEUE_SIZE", "1000"))
+FANOUT_QUEUE_SIZE = int(os.getenv("FANOUT_QUEUE_SIZE", "1000"))
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", "4"))
+BROWSER_SEND_QUEUE_SIZE = int(os.getenv("BROWSER_SEND_QUEUE_SIZE", "32"))  # pending topics per browser
+SLOW_CONSUMER_TIMEOUT = float(os.getenv("SLOW_CONSUMER_TIMEOUT", "15"))  # seconds behind before eviction
+BROADCAST_TICK_MS = int(os.getenv("BROADCAST_TICK_MS", "250"))  # max one broadcast per topic per tick
+BROADCAST_FAST_LANE = os.getenv("BROADCAST_FAST_LANE", "1") == "1"  # score changes skip the tick
+BROADCAST_FAST_LANE_MS = int(os.getenv("BROADCAST_FAST_LANE_MS", "25"))
+
+# Cross-worker fan-out backplane: "memory" (single worker) or "redis"
+BACKPLANE = os.getenv("BACKPLANE", "memory")
+BACKPLANE_URL = os.getenv("BACKPLANE_URL", "redis://localhost:6379/0")  # or unix:///path/to/redis.sock
+BACKPLANE_PREFIX = os.getenv("BACKPLANE_PREFIX", "lsl")
+BACKPLANE_START_TIMEOUT = float(os.getenv("BACKPLANE_START_TIMEOUT", "10"))  # seconds; startup fails after this
+
+# HTTP caching (ETag / Cache-Control on /api and pages)
+# Part of every ETag so a deploy never revalidates against old markup; set it
+# per release when running several workers (defaults to the process start time).
+RELEASE = os.getenv("RELEASE", os.getenv("HEROKU_SLUG_COMMIT", ""))
+CACHE_CONTROL_LIVE = os.getenv("CACHE_CONTROL_LIVE", "no-cache")  # revalidate every time; 304s are cheap
+FINAL_GAME_MAX_AGE = int(os.getenv("FINAL_GAME_MAX_AGE", "86400"))  # seconds; final games are immutable
+
+# Batch API (/api/games)
+API_BATCH_MAX_GAMES = int(os.getenv("API_BATCH_MAX_GAMES", "50"))
+
+# Shared-memory read replica for extra workers (in-process backplane only).
+# It serves HTTP reads only; live pushes need BACKPLANE=redis, so in
+# sportradar mode "auto" refuses to start with WEB_CONCURRENCY > 1 and the
+# memory backplane. "1" opts in to HTTP-only extra workers.
+SHARED_REPLICA = os.getenv("SHARED_REPLICA", "auto")  # "auto", "1" or "0"
+SHARED_REPLICA_PATH = os.getenv("SHARED_REPLICA_PATH", "")  # default: /dev/shm/lsl-replica (or <tmp>)
+SHARED_REPLICA_INTERVAL = float(os.getenv("SHARED_REPLICA_INTERVAL", "0.5"))  # seconds between publishes
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Rendered page cache (home.html / game.html per data version)
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "512"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # all variants together
+PAGE_CACHE_ENCODINGS = os.getenv("PAGE_CACHE_ENCODINGS", "br,gzip")  # pre-compressed variants; "" for none
+
+# Static assets (fingerprinted + pre-compressed copies built at startup)
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR", "")  # default: <tmp>/lsl-static
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(365 * 24 * 3600)))  # hashed names only
@@ -0,0 +1,131 @@
+"""Warm-start snapshots of the SR cache in a local SQLite file.
+
+After a deploy or restart the cache would be empty until the relay pushes
+something that changed — which, as far as its change tracker knows, may be
+never. Instead the cache is written to disk every few seconds (only when it
+changed) and loaded back in the FastAPI lifespan before the first request.
+
+One row per entry with a zlib-compressed JSON payload. Each snapshot is
+written to a temp file and renamed into place, so readers and concurrent
+workers never see a partial file. Restored entries are flagged ``restored``
+(see ``SRCache.stale``) until live data replaces them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from .sr_cache import SRCache
+
+log = logging.getLogger("cache_snapshot")
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+
+def _rows(cache: SRCache) -> list[tuple]:
+    """Entries to persist. Taken on the event loop thread; payloads are never mutated after a write."""
+    rows = []
+    for kind, store in (("schedule", cache.schedules), ("summary", cache.summaries), ("pbp", cache.pbp)):
+        for key, entry in list(store.items()):
+            rows.append((kind, key, entry.updated_at, entry.size, entry.data))
+    return rows
+
+
+def _write(path: Path, rows: list[tuple], taken_at: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp)
+    try:
+        db.executescript(_SCHEMA)
+        db.execute("INSERT INTO meta VALUES ('taken_at', ?)", (repr(taken_at),))
+        db.executemany(
+            "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+            ((kind, key, updated_at, size, zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 1))
+             for kind, key, updated_at, size, data in rows),
+        )
+        db.commit()
+    finally:
+        db.close()
+    os.replace(tmp, path)
+
+
+def save_snapshot(cache: SRCache, path: Path) -> int:
+    """Write the whole cache to ``path``. Returns the number of entries written."""
+    rows = _rows(cache)
+    _write(path, rows, time.time())
+    return len(rows)
+
+
+def load_snapshot(cache: SRCache, path: Path, max_age: float) -> int:
+    """Fill ``cache`` from ``path`` if it exists and is at most ``max_age`` seconds old.
+
+    Returns the number of entries restored.
+    """
+    if not path.exists():
+        return 0
+    try:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            taken_at = float(db.execute("SELECT value FROM meta WHERE key = 'taken_at'").fetchone()[0])
+            age = time.time() - taken_at
+            if age > max_age:
+                log.info("Ignoring cache snapshot %s — %.0fs old", path, age)
+                return 0
+            rows = db.execute("SELECT kind, key, updated_at, size, data FROM entries").fetchall()
+        finally:
+            db.close()
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        log.warning("Unreadable cache snapshot %s: %s", path, e)
+        return 0
+
+    # Decode everything before touching the cache: a corrupt row means a cold start, not half a snapshot
+    try:
+        entries = [(kind, key, json.loads(zlib.decompress(blob)), updated_at, size)
+                   for kind, key, updated_at, size, blob in rows]
+    except (zlib.error, ValueError, TypeError) as e:
+        log.warning("Corrupt cache snapshot %s, starting cold: %s", path, e)
+        return 0
+    for entry in entries:
+        cache.restore(*entry)
+    cache.finish_restore(taken_at)
+    log.info("Restored %d cache entries from snapshot (%.0fs old)", len(rows), age)
+    return len(rows)
+
+
+async def run_snapshots(cache: SRCache, path: Path, interval: float):
+    """Snapshot ``cache`` every ``interval`` seconds while it keeps changing; once more on cancel."""
+    last = cache.last_version
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            if cache.last_version == last:
+                continue
+            try:
+                version = cache.last_version
+                rows = _rows(cache)
+                await asyncio.to_thread(_write, path, rows, time.time())
+                last = version
+            except Exception:
+                log.exception("Cache snapshot failed")
+    finally:
+        if cache.last_version != last:
+            try:
+                save_snapshot(cache, path)
+            except Exception:
+                log.exception("Final cache snapshot failed")
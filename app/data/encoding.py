@@ -0,0 +1,79 @@
+"""Fast JSON encoding for the data models.
+
+``dataclasses.asdict`` deep-copies recursively and ``json.dumps`` /
+``jsonable_encoder`` then walk the result again. The models are flat and
+immutable, so ``json_model`` generates, per class, a ``to_dict`` that is a
+single dict literal and a ``to_json`` that concatenates the JSON text
+directly. The encoded text is cached on the instance — the SR provider
+memoizes its models by cache version, so each one is encoded once.
+
+Output is compact (no spaces) but otherwise what ``json.dumps`` produces.
+"""
+
+import dataclasses
+from json import dumps
+from json.encoder import encode_basestring_ascii as _str
+
+
+def compact_json(value) -> str:
+    return dumps(value, separators=(",", ":"))
+
+
+def _value_expr(name: str, ftype) -> str:
+    # Exact-type fast paths; anything unexpected (None, floats from the feed)
+    # still goes through json.dumps so the output stays valid.
+    v = f"o.{name}"
+    if ftype is str:
+        return f"(_str({v}) if {v}.__class__ is str else _compact({v}))"
+    if ftype is int:
+        return f"(int.__repr__({v}) if {v}.__class__ is int else _compact({v}))"
+    return f"_compact({v})"
+
+
+def json_model(cls):
+    """Class decorator for flat slotted dataclasses with a ``_json`` cache field.
+
+    Adds ``to_dict()``, ``to_json()`` and the inverse ``from_dict()``
+    classmethod, generated from the public fields.
+    """
+    fields = [f for f in dataclasses.fields(cls) if not f.name.startswith("_")]
+    parts = []
+    for i, f in enumerate(fields):
+        key = ("{" if i == 0 else ",") + _str(f.name) + ":"
+        parts.append(f"{key!r} + {_value_expr(f.name, f.type)}")
+    items = ", ".join(f"{f.name!r}: o.{f.name}" for f in fields)
+    args = ", ".join(f"d[{f.name!r}]" for f in fields)
+    src = (
+        f"def from_dict(cls, d):\n"
+        f"    return cls({args})\n"
+        "def to_dict(o):\n"
+        f"    return {{{items}}}\n"
+        "def to_json(o):\n"
+        "    s = o._json\n"
+        "    if s is None:\n"
+        f"        s = {' + '.join(parts)} + '}}'\n"
+        "        _set(o, '_json', s)\n"
+        "    return s\n"
+    )
+    ns = {"_str": _str, "_compact": compact_json, "_set": object.__setattr__}
+    exec(compile(src, f"<json_model {cls.__name__}>", "exec"), ns)
+    ns["to_dict"].__qualname__ = f"{cls.__name__}.to_dict"
+    ns["to_json"].__qualname__ = f"{cls.__name__}.to_json"
+    cls.from_dict = classmethod(ns["from_dict"])
+    cls.to_dict = ns["to_dict"]
+    cls.to_json = ns["to_json"]
+    return cls
+
+
+def json_array(items) -> str:
+    """JSON array of already-``to_json``-able models."""
+    return "[" + ",".join([item.to_json() for item in items]) + "]"
+
+
+def json_message(fields: dict, **encoded: str) -> str:
+    """``json.dumps(fields)`` plus keys whose values are already-encoded JSON text."""
+    head = compact_json(fields)
+    tail = "".join([f",{_str(k)}:{v}" for k, v in encoded.items()])
+    if head == "{}":
+        return "{" + tail[1:] + "}"
+    return head[:-1] + tail + "}"
@@ -0,0 +1,237 @@
+"""Incrementally parsed play-by-play, one append-friendly event list per game.
+
+SR resends the whole PBP document on every update. Instead of re-walking
+every period and rebuilding every ``PlayEvent``, each game keeps the events
+parsed last time and only re-parses what changed:
+
+- closed periods whose raw events compare equal to last time's are reused
+  as-is (one C-level compare, no parsing);
+- inside the other periods, events whose raw fields are unchanged reuse their
+  existing ``PlayEvent``.
+
+Event ids are SR's own event ids (or a content hash when SR gives none), so
+they survive inserts and corrections. ``seq`` is assigned the first time an
+event is seen and only ever grows — it is the cursor for streaming and
+catch-up (``since``).
+"""
+
+import hashlib
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+from .provider import PlayEvent
+
+
+class NewestFirst(Sequence):
+    """Read-only newest-first view over the first ``n`` items of an oldest-first list."""
+
+    __slots__ = ("_items", "_n")
+
+    def __init__(self, items: list, n: int | None = None):
+        self._items = items
+        self._n = len(items) if n is None else n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self._items[self._n - 1 - i]
+
+    def __iter__(self):
+        items = self._items
+        for i in range(self._n - 1, -1, -1):
+            yield items[i]
+
+
+def _event_id(event: dict, period_num: int) -> str:
+    eid = event.get("id")
+    if eid:
+        return eid
+    raw = f"{period_num}|{event.get('clock', '')}|{event.get('event_type', '')}|{event.get('description', '')}"
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def _raw_signature(event: dict, period_num: int) -> tuple:
+    return (
+        period_num,
+        event.get("description", ""),
+        event.get("clock", ""),
+        event.get("home_points"),
+        event.get("away_points"),
+        event.get("updated"),
+    )
+
+
+class GameEvents:
+    """Parsed PBP for one game: chronological list + seq-ordered index."""
+
+    def __init__(self):
+        # Oldest first, in SR order. Only ever extended in place; any other
+        # change builds a new list so views handed out earlier stay intact.
+        self.events: list[PlayEvent] = []
+        # Same events in seq order (append order), with their seqs for bisect
+        self._by_seq: list[PlayEvent] = []
+        self._seqs: list[int] = []
+        self._by_id: dict[str, PlayEvent] = {}
+        self._sigs: dict[str, tuple] = {}
+        # Per period: (number, raw event list) and its span in events
+        self._period_sigs: list[tuple] = []
+        self._period_spans: list[tuple[int, int]] = []
+        self._next_seq = 0
+        self.source: dict | None = None
+
+    @property
+    def last_seq(self) -> int:
+        return self._seqs[-1] if self._seqs else -1
+
+    def newest_first(self) -> NewestFirst:
+        return NewestFirst(self.events)
+
+    def since(self, after_seq: int) -> list[PlayEvent]:
+        """Events first seen after ``after_seq``, oldest first."""
+        return self._by_seq[bisect_right(self._seqs, after_seq):]
+
+    def seq_of(self, event_id: str) -> int | None:
+        ev = self._by_id.get(event_id)
+        return ev.seq if ev is not None else None
+
+    def page(self, after_seq: int = -1, before_seq: int | None = None,
+             limit: int | None = None) -> tuple[list[PlayEvent], bool]:
+        """Newest-first window of seq order: ``after_seq < seq < before_seq``, newest ``limit``.
+
+        Only the returned slice is touched, so "latest N" is O(N + log n).
+        Returns (events, whether the window has older events than the page).
+        """
+        floor = bisect_right(self._seqs, after_seq) if after_seq >= 0 else 0
+        hi = len(self._seqs) if before_seq is None else bisect_left(self._seqs, before_seq)
+        lo = max(floor, hi - limit) if limit is not None else floor
+        page = self._by_seq[lo:hi]
+        page.reverse()
+        return page, lo > floor
+
+    def update(self, pbp_data: dict):
+        if pbp_data is self.source:
+            return
+        self.source = pbp_data
+
+        old_events = self.events
+        events: list[PlayEvent] = []
+        period_sigs: list[tuple] = []
+        period_spans: list[tuple[int, int]] = []
+        by_id: dict[str, PlayEvent] = {}
+        added: list[PlayEvent] = []
+        rewritten = False
+
+        periods = pbp_data.get("periods", [])
+        last = len(periods) - 1
+        for pi, per in enumerate(periods):
+            period_num = per.get("number", 0)
+            raw = per.get("events", [])
+            # Compared by content, so SR corrections inside a closed period are picked up
+            sig = (period_num, raw)
+            start = len(events)
+            if pi < last and pi < len(self._period_sigs) and self._period_sigs[pi] == sig:
+                # Closed period, unchanged — reuse what we parsed last time
+                s, e = self._period_spans[pi]
+                block = old_events[s:e]
+                events.extend(block)
+                for ev in block:
+                    by_id[ev.event_id] = ev
+            else:
+                for event in raw:
+                    if not event.get("description"):
+                        continue
+                    eid = _event_id(event, period_num)
+                    if eid in by_id:
+                        continue  # duplicate in the feed
+                    raw_sig = _raw_signature(event, period_num)
+                    ev = self._by_id.get(eid)
+                    if ev is None:
+                        ev = self._parse(event, eid, self._next_seq, period_num)
+                        self._next_seq += 1
+                        added.append(ev)
+                    elif self._sigs.get(eid) != raw_sig:
+                        # Corrected by SR: same id and seq, new content
+                        ev = self._parse(event, eid, ev.seq, period_num)
+                        rewritten = True
+                    self._sigs[eid] = raw_sig
+                    events.append(ev)
+                    by_id[eid] = ev
+            period_sigs.append(sig)
+            period_spans.append((start, len(events)))
+
+        removed = len(by_id) - len(added) != len(self._by_id)
+        if removed:
+            for eid in self._by_id.keys() - by_id.keys():
+                self._sigs.pop(eid, None)
+
+        n = len(old_events)
+        if len(events) >= n and all(a is b for a, b in zip(events, old_events)):
+            old_events.extend(events[n:])
+        else:
+            self.events = events
+
+        if removed or rewritten:
+            self._by_seq = sorted(by_id.values(), key=lambda ev: ev.seq)
+            self._seqs = [ev.seq for ev in self._by_seq]
+        else:
+            self._by_seq.extend(added)
+            self._seqs.extend(ev.seq for ev in added)
+
+        self._by_id = by_id
+        self._period_sigs = period_sigs
+        self._period_spans = period_spans
+
+    @staticmethod
+    def _parse(event: dict, event_id: str, seq: int, period_num: int) -> PlayEvent:
+        # Try to determine team
+        team = ""
+        attribution = event.get("attribution", {})
+        if attribution:
+            team = attribution.get("market", attribution.get("name", ""))[:3].upper()
+
+        # Player name
+        player = ""
+        if event.get("statistics"):
+            stat = event["statistics"][0] if event["statistics"] else {}
+            player_info = stat.get("player", {})
+            player = player_info.get("full_name", "")
+
+        return PlayEvent(
+            event_id=event_id,
+            seq=seq,
+            clock=event.get("clock", ""),
+            period=period_num,
+            team=team,
+            player=player,
+            description=event.get("description", ""),
+            home_score=event.get("home_points", 0) or 0,
+            away_score=event.get("away_points", 0) or 0,
+        )
+
+
+class PbpStore:
+    """game_id -> GameEvents, shared by every provider instance."""
+
+    def __init__(self):
+        self._games: dict[str, GameEvents] = {}
+
+    def get(self, game_id: str, pbp_data: dict) -> GameEvents:
+        game = self._games.get(game_id)
+        if game is None:
+            game = self._games[game_id] = GameEvents()
+        game.update(pbp_data)
+        return game
+
+    def discard(self, game_id: str):
+        self._games.pop(game_id, None)
+
+
+# Module-level singleton
+pbp_store = PbpStore()
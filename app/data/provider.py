@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field, asdict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 
+from .encoding import compact_json, json_array, json_model
 
-@dataclass
+
+@json_model
+@dataclass(frozen=True, slots=True)
 class GameSummary:
     game_id: str
     sport: str              # "nba" or "ncaamb"
@@ -15,11 +19,11 @@ class GameSummary:
     clock: str
     start_time: str
 
-    def to_dict(self):
-        return asdict(self)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
 
-@dataclass
+@json_model
+@dataclass(frozen=True, slots=True)
 class PlayerStats:
     name: str
     position: str
@@ -34,13 +38,14 @@ class PlayerStats:
     ft: str
     plus_minus: int
 
-    def to_dict(self):
-        return asdict(self)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
 
-@dataclass
+@json_model
+@dataclass(frozen=True, slots=True)
 class PlayEvent:
-    event_id: int
+    event_id: str           # SR event id (or content hash) — stable across refetches
+    seq: int                # first-seen order, the streaming/catch-up cursor
     clock: str
     period: int
     team: str
@@ -49,28 +54,105 @@ class PlayEvent:
     home_score: int
     away_score: int
 
-    def to_dict(self):
-        return asdict(self)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GameDetail:
     summary: GameSummary
-    home_players: list[PlayerStats] = field(default_factory=list)
-    away_players: list[PlayerStats] = field(default_factory=list)
-    play_by_play: list[PlayEvent] = field(default_factory=list)
-    home_team_stats: dict = field(default_factory=dict)
-    away_team_stats: dict = field(default_factory=dict)
-
-    def to_dict(self):
-        return {
+    home_players: Sequence[PlayerStats] = ()
+    away_players: Sequence[PlayerStats] = ()
+    play_by_play: Sequence[PlayEvent] = ()        # newest first
+    home_team_stats: Mapping = field(default_factory=dict)
+    away_team_stats: Mapping = field(default_factory=dict)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
+    _json_no_pbp: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "GameDetail":
+        """Inverse of ``to_dict`` (sections missing from ``d`` are left empty)."""
+        return cls(
+            summary=GameSummary.from_dict(d["summary"]),
+            home_players=tuple(map(PlayerStats.from_dict, d.get("home_players", ()))),
+            away_players=tuple(map(PlayerStats.from_dict, d.get("away_players", ()))),
+            play_by_play=tuple(map(PlayEvent.from_dict, d.get("play_by_play", ()))),
+            home_team_stats=d.get("home_team_stats", {}),
+            away_team_stats=d.get("away_team_stats", {}),
+        )
+
+    def to_dict(self, include_pbp: bool = True):
+        d = {
             "summary": self.summary.to_dict(),
             "home_players": [p.to_dict() for p in self.home_players],
             "away_players": [p.to_dict() for p in self.away_players],
-            "play_by_play": [e.to_dict() for e in self.play_by_play],
-            "home_team_stats": self.home_team_stats,
-            "away_team_stats": self.away_team_stats,
         }
+        if include_pbp:
+            d["play_by_play"] = [e.to_dict() for e in self.play_by_play]
+        d["home_team_stats"] = dict(self.home_team_stats)
+        d["away_team_stats"] = dict(self.away_team_stats)
+        return d
+
+    def to_json(self, include_pbp: bool = True) -> str:
+        """Same document as ``to_dict``, encoded; cached per variant."""
+        slot = "_json" if include_pbp else "_json_no_pbp"
+        s = getattr(self, slot)
+        if s is None:
+            s = "{" + ",".join(
+                f'"{name}":{self.section_json(name)}'
+                for name in GAME_SECTIONS if include_pbp or name != "play_by_play"
+            ) + "}"
+            object.__setattr__(self, slot, s)
+        return s
+
+    def select_json(self, sections) -> str:
+        """Only ``sections`` (in ``GAME_SECTIONS`` order), encoded; full variants are cached."""
+        sections = tuple(sections)
+        if sections == GAME_SECTIONS:
+            return self.to_json()
+        if sections == _GAME_SECTIONS_NO_PBP:
+            return self.to_json(include_pbp=False)
+        return "{" + ",".join(f'"{name}":{self.section_json(name)}' for name in sections) + "}"
+
+    def section_json(self, name: str) -> str:
+        """One top-level section (see ``GAME_SECTIONS``), encoded."""
+        if name == "summary":
+            return self.summary.to_json()
+        if name in ("home_team_stats", "away_team_stats"):
+            return compact_json(dict(getattr(self, name)))
+        return json_array(getattr(self, name))
+
+
+# Top-level sections of an encoded GameDetail, in document order
+GAME_SECTIONS = ("summary", "home_players", "away_players", "play_by_play", "home_team_stats", "away_team_stats")
+_GAME_SECTIONS_NO_PBP = tuple(name for name in GAME_SECTIONS if name != "play_by_play")
+
+
+@dataclass(frozen=True, slots=True)
+class PbpPage:
+    events: Sequence[PlayEvent]     # newest first
+    has_more: bool                  # the requested range has older events than this page
+    last_seq: int                   # newest seq in the game, the catch-up cursor
+
+
+class UnknownCursor(LookupError):
+    """A pagination cursor names an event the game no longer has."""
+
+
+def paginate_events(events: Sequence[PlayEvent], since_event_id: str | None = None,
+                    before_event_id: str | None = None, limit: int | None = None) -> PbpPage:
+    """Generic paging over an oldest-first event list (providers without an index)."""
+    def position(event_id: str) -> int:
+        for i, e in enumerate(events):
+            if e.event_id == event_id:
+                return i
+        raise UnknownCursor(event_id)
+
+    floor = position(since_event_id) + 1 if since_event_id else 0
+    hi = position(before_event_id) if before_event_id else len(events)
+    lo = max(floor, hi - limit) if limit is not None else floor
+    page = list(events[lo:hi])
+    page.reverse()
+    return PbpPage(page, lo > floor, events[-1].seq if events else -1)
 
 
 class DataProvider(ABC):
@@ -85,3 +167,32 @@ class DataProvider(ABC):
     @abstractmethod
     async def get_play_by_play(self, game_id: str) -> list[PlayEvent]:
         ...
+
+    async def get_game_status(self, game_id: str) -> str | None:
+        """The game's ``GameSummary.status``, or None for an unknown game.
+
+        Lets a request answer 304 without building the game; providers with
+        an index override it.
+        """
+        detail = await self.get_game(game_id)
+        return detail.summary.status if detail else None
+
+    async def get_play_by_play_page(self, game_id: str, since_event_id: str | None = None,
+                                    before_event_id: str | None = None,
+                                    limit: int | None = None) -> PbpPage:
+        """A window of PBP, newest first: after ``since_event_id``, before
+        ``before_event_id``, at most the newest ``limit`` of those.
+
+        Raises ``UnknownCursor`` if a cursor event isn't in the game.
+        """
+        events = list(reversed(await self.get_play_by_play(game_id)))
+        return paginate_events(events, since_event_id, before_event_id, limit)
+
+    async def get_games(self, game_ids: Sequence[str],
+                        include_pbp: bool = True) -> dict[str, GameDetail | None]:
+        """Several games at once, keyed by id (None for unknown ids).
+
+        ``include_pbp=False`` tells providers that fetch PBP on demand that the
+        caller won't read it.
+        """
+        return {game_id: await self.get_game(game_id) for game_id in game_ids}
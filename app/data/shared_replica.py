@@ -0,0 +1,212 @@
+"""Memory-mapped read replica of the mapped SR data, for multi-worker serving.
+
+With the in-process backplane only the worker holding the relay socket has
+data. That worker publishes an immutable snapshot of what HTTP reads — the
+encoded scoreboard per sport and every game's full detail — into one file
+(on ``/dev/shm`` where available). The other workers ``mmap`` it and read
+slices without copying; decoded models are memoized per generation.
+
+Each publish writes a new file and renames it over the old one. Readers
+notice the new inode with one ``stat`` and remap it; a mapping they still
+hold stays valid, so a snapshot is never modified under a reader.
+
+File layout::
+
+    header  "<4sIQdQQ"  magic, format, generation, published_at, index offset, index length
+    blobs   UTF-8 JSON, back to back
+    index   JSON {key: [offset, length]}   keys: "scoreboard:<sport|all>", "game:<id>"
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Callable
+
+from .encoding import json_array
+from .provider import DataProvider, GameDetail, GameSummary, PbpPage, PlayEvent
+from .sr_cache import cache
+from .sr_provider import SRProvider
+
+log = logging.getLogger("shared_replica")
+
+_MAGIC = b"LSLR"
+_FORMAT = 1
+_HEADER = struct.Struct("<4sIQdQQ")
+
+
+def write_replica(path: Path, blobs: dict[str, str], generation: int):
+    """Write ``blobs`` as a new replica file and atomically swap it in."""
+    index = {}
+    chunks = []
+    offset = _HEADER.size
+    for key, text in blobs.items():
+        data = text.encode()
+        index[key] = (offset, len(data))
+        chunks.append(data)
+        offset += len(data)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode()
+    header = _HEADER.pack(_MAGIC, _FORMAT, generation, time.time(), offset, len(index_bytes))
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.writelines(chunks)
+        f.write(index_bytes)
+    os.replace(tmp, path)
+
+
+class ReplicaReader:
+    def __init__(self, path: Path):
+        self.path = path
+        self._ident: tuple | None = None
+        self._map: mmap.mmap | None = None
+        self._index: dict[str, list[int]] = {}
+        self._memo: dict[str, object] = {}
+        self.generation = 0
+        self.published_at = 0.0
+        self.remaps = 0
+
+    def _refresh(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        ident = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if ident == self._ident:
+            return True
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, fmt, generation, published_at, index_off, index_len = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC or fmt != _FORMAT:
+                raise ValueError(f"not a replica file (format {fmt})")
+            index = json.loads(mm[index_off:index_off + index_len])
+        except (OSError, ValueError, struct.error) as e:
+            log.warning("Unreadable replica %s: %s", self.path, e)
+            return self._map is not None
+        # The previous mapping is dropped, not closed: slices handed out may still use it
+        self._map, self._index, self._ident = mm, index, ident
+        self.generation, self.published_at = generation, published_at
+        self._memo = {}
+        self.remaps += 1
+        return True
+
+    def raw(self, key: str) -> memoryview | None:
+        """Zero-copy view of one encoded blob in the current snapshot."""
+        if not self._refresh():
+            return None
+        loc = self._index.get(key)
+        if loc is None:
+            return None
+        offset, length = loc
+        return memoryview(self._map)[offset:offset + length]
+
+    def _decoded(self, key: str, decode: Callable):
+        if not self._refresh():
+            return None
+        if key in self._memo:
+            return self._memo[key]
+        view = self.raw(key)
+        value = decode(view) if view is not None else None
+        self._memo[key] = value
+        return value
+
+    @property
+    def available(self) -> bool:
+        return self._refresh()
+
+    def scoreboard(self, sport: str) -> list[GameSummary] | None:
+        return self._decoded(
+            f"scoreboard:{sport}",
+            lambda view: [GameSummary.from_dict(d) for d in json.loads(view.tobytes())],
+        )
+
+    def game(self, game_id: str) -> GameDetail | None:
+        def decode(view):
+            text = view.tobytes().decode()
+            detail = GameDetail.from_dict(json.loads(text))
+            object.__setattr__(detail, "_json", text)  # already encoded, exactly
+            return detail
+        return self._decoded(f"game:{game_id}", decode)
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            "generation": self.generation,
+            "age_s": round(time.time() - self.published_at, 1) if self.published_at else None,
+            "keys": len(self._index),
+            "remaps": self.remaps,
+        }
+
+
+class ReplicaProvider(DataProvider):
+    """Serves from the local SR cache when this worker is the primary, else from the replica."""
+
+    def __init__(self, local: SRProvider, reader: ReplicaReader, is_primary: Callable[[], bool]):
+        self.local = local
+        self.reader = reader
+        self.is_primary = is_primary
+
+    def _use_local(self) -> bool:
+        return self.is_primary() or not self.reader.available
+
+    async def get_scoreboard(self, sport: str = "all") -> list[GameSummary]:
+        if self._use_local():
+            return await self.local.get_scoreboard(sport)
+        return self.reader.scoreboard(sport) or []
+
+    async def get_game(self, game_id: str) -> GameDetail | None:
+        if self._use_local():
+            return await self.local.get_game(game_id)
+        return self.reader.game(game_id)
+
+    async def get_game_status(self, game_id: str) -> str | None:
+        if self._use_local():
+            return await self.local.get_game_status(game_id)
+        return await super().get_game_status(game_id)
+
+    async def get_games(self, game_ids, include_pbp: bool = True) -> dict[str, GameDetail | None]:
+        if self._use_local():
+            return await self.local.get_games(game_ids, include_pbp)
+        return await super().get_games(game_ids, include_pbp)
+
+    async def get_play_by_play(self, game_id: str) -> list[PlayEvent]:
+        if self._use_local():
+            return await self.local.get_play_by_play(game_id)
+        detail = self.reader.game(game_id)
+        return list(detail.play_by_play) if detail else []
+
+    async def get_play_by_play_page(self, game_id: str, since_event_id: str | None = None,
+                                    before_event_id: str | None = None,
+                                    limit: int | None = None) -> PbpPage:
+        if self._use_local():
+            return await self.local.get_play_by_play_page(game_id, since_event_id, before_event_id, limit)
+        return await super().get_play_by_play_page(game_id, since_event_id, before_event_id, limit)
+
+
+async def run_publisher(provider: SRProvider, path: Path, interval: float, is_primary: Callable[[], bool]):
+    """While this worker is the primary, publish a new replica whenever the cache changed."""
+    published = 0
+    while True:
+        await asyncio.sleep(interval)
+        if not is_primary() or cache.last_version == published:
+            continue
+        try:
+            version = cache.last_version
+            blobs = {"scoreboard:all": json_array(await provider.get_scoreboard("all"))}
+            for sport in list(cache.schedules):
+                blobs[f"scoreboard:{sport}"] = json_array(await provider.get_scoreboard(sport))
+            for game_id in cache.get_all_game_ids():
+                detail = provider._detail(game_id)  # not get_game: publishing isn't PBP demand
+                if detail is not None:
+                    blobs[f"game:{game_id}"] = detail.to_json()
+            await asyncio.to_thread(write_replica, path, blobs, version)
+            published = version
+        except Exception:
+            log.exception("Replica publish failed")
+
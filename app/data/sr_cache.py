@@ -2,16 +2,51 @@
 
 All website visitors read from this one cache — zero per-user API calls.
 The background poller (sr_poller.py) is the only writer.
+
+Summaries and PBP are bounded: ``sweep`` drops entries idle past their
+type's TTL (shorter for final games), then least-recently-used entries while
+the cache is over ``max_bytes``. Sizes are approximate — the JSON size of
+the payload. Entries the ``is_watched`` callback reports as watched by a
+current subscriber are never evicted.
 """
 
+import itertools
+import json
+import logging
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from typing import Callable
+
+from .. import config
+
+log = logging.getLogger("sr_cache")
+
+_LIVE_STATUSES = ("inprogress", "halftime")
+_FINAL_STATUSES = ("closed", "complete")
 
 
 @dataclass
 class CacheEntry:
     data: dict
     updated_at: float = 0.0
+    version: int = 0        # unique per write, cache-wide; keys anything derived from the entry
+    size: int = 0           # approximate bytes (JSON size of data)
+    accessed_at: float = 0.0
+    restored: bool = False  # loaded from a warm-start snapshot, not yet refreshed live
+
+
+def _json_size(data: dict) -> int:
+    return len(json.dumps(data, separators=(",", ":")))
+
+
+@dataclass
+class GameRef:
+    """Index entry: everything cached for one game, found in O(1)."""
+    sport: str
+    schedule: dict                    # this game's entry in the sport's schedule
+    summary: CacheEntry | None = None
+    pbp: CacheEntry | None = None
+    schedule_version: int = 0         # cache version of the write that last changed this game's entry
 
 
 class SRCache:
@@ -24,19 +59,139 @@ class SRCache:
         self.summaries: dict[str, CacheEntry] = {}
         # {game_id: pbp_json}
         self.pbp: dict[str, CacheEntry] = {}
+        self._versions = itertools.count(1)
+        self.last_version = 0   # version of the latest write; lets snapshots skip an unchanged cache
         # Games that have active viewers wanting PBP data
         self._pbp_requested: set[str] = set()
+        # {game_id: GameRef} across all sports, plus precomputed id lists.
+        # Rebuilt and swapped in as a whole by set_schedule.
+        self._games: dict[str, GameRef] = {}
+        self._live_ids: list[str] = []
+        self._all_ids: list[str] = []
+        # Bounds and accounting
+        self.max_bytes = config.SR_CACHE_MAX_BYTES
+        self.bytes = 0
+        self.evictions = {"summary": 0, "pbp": 0}
+        self.refused = 0
+        self._swept_at = 0.0
+        # Warm start: when the snapshot was taken, if the cache was loaded from one
+        self.restored_at: float | None = None
+        # (kind, game_id) -> True while a subscriber depends on it; set by the realtime manager
+        self.is_watched: Callable[[str, str], bool] | None = None
+        # Called with (kind, game_id) after an eviction, to drop derived state
+        self._evict_listeners: list[Callable[[str, str], None]] = []
 
     # ── Writers (called by poller) ──────────────────────────────────
 
-    def set_schedule(self, sport: str, data: dict):
-        self.schedules[sport] = CacheEntry(data=data, updated_at=time.time())
+    def _entry(self, data: dict, size: int | None) -> CacheEntry:
+        now = time.time()
+        self.last_version = next(self._versions)
+        return CacheEntry(data=data, updated_at=now, version=self.last_version,
+                          size=_json_size(data) if size is None else size, accessed_at=now)
+
+    def _store(self, store: dict, key: str, entry: CacheEntry):
+        old = store.get(key)
+        self.bytes += entry.size - (old.size if old else 0)
+        store[key] = entry
+        # Throttled: if everything left is watched, don't rescan on every write
+        if self.bytes > self.max_bytes and entry.updated_at - self._swept_at > 1.0:
+            self.sweep()
+
+    def set_schedule(self, sport: str, data: dict, size: int | None = None):
+        entry = self._entry(data, size)
+        old = self.schedules.get(sport)
+        self.bytes += entry.size - (old.size if old else 0)
+        self.schedules[sport] = entry
+        self._rebuild_index()
+
+    def set_summary(self, game_id: str, data: dict, size: int | None = None):
+        entry = self._entry(data, size)
+        ref = self._games.get(game_id)
+        if ref is not None:
+            ref.summary = entry
+        self._store(self.summaries, game_id, entry)
+
+    def set_pbp(self, game_id: str, data: dict, size: int | None = None):
+        entry = self._entry(data, size)
+        ref = self._games.get(game_id)
+        if ref is not None:
+            ref.pbp = entry
+        self._store(self.pbp, game_id, entry)
+
+    def patch_schedule(self, sport: str, changed: list[dict], removed: list[str]) -> bool:
+        """Apply a per-game schedule delta: replace/append ``changed`` entries, drop ``removed`` ids.
+
+        Returns False (and changes nothing) if there is no schedule to patch.
+        """
+        entry = self.schedules.get(sport)
+        if entry is None:
+            return False
+        updates = {g["id"]: g for g in changed if g.get("id")}
+        removed = set(removed)
+        games = []
+        delta = 0
+        for game in entry.data.get("games", []):
+            gid = game.get("id", "")
+            if gid in removed:
+                delta -= _json_size(game)
+                continue
+            new = updates.pop(gid, None)
+            if new is not None:
+                delta += _json_size(new) - _json_size(game)
+                game = new
+            games.append(game)
+        for game in updates.values():
+            games.append(game)
+            delta += _json_size(game)
+
+        patched = self._entry({**entry.data, "games": games}, max(0, entry.size + delta))
+        self.bytes += patched.size - entry.size
+        self.schedules[sport] = patched
+        self._rebuild_index()
+        return True
+
+    def _rebuild_index(self):
+        games: dict[str, GameRef] = {}
+        live: list[str] = []
+        old = self._games
+        for sport, entry in self.schedules.items():
+            for game in entry.data.get("games", []):
+                gid = game.get("id", "")
+                if not gid or gid in games:
+                    continue
+                # Unchanged entries keep their version, so per-game derived state stays valid
+                prev = old.get(gid)
+                version = (prev.schedule_version
+                           if prev is not None and (prev.schedule is game or prev.schedule == game)
+                           else entry.version)
+                games[gid] = GameRef(sport, game, self.summaries.get(gid), self.pbp.get(gid), version)
+                if game.get("status", "") in _LIVE_STATUSES:
+                    live.append(gid)
+        # Swap in one go so readers never see a half-built index
+        self._games, self._live_ids, self._all_ids = games, live, list(games)
+
+    def restore(self, kind: str, key: str, data: dict, updated_at: float, size: int):
+        """Load one entry from a warm-start snapshot (see cache_snapshot.py).
+
+        Keeps the original ``updated_at`` and flags the entry ``restored``;
+        call ``finish_restore`` once everything is loaded.
+        """
+        entry = self._entry(data, size)
+        entry.updated_at = updated_at
+        entry.restored = True
+        store = {"schedule": self.schedules, "summary": self.summaries, "pbp": self.pbp}[kind]
+        old = store.get(key)
+        self.bytes += entry.size - (old.size if old else 0)
+        store[key] = entry
 
-    def set_summary(self, game_id: str, data: dict):
-        self.summaries[game_id] = CacheEntry(data=data, updated_at=time.time())
+    def finish_restore(self, taken_at: float):
+        self._rebuild_index()
+        self.restored_at = taken_at
 
-    def set_pbp(self, game_id: str, data: dict):
-        self.pbp[game_id] = CacheEntry(data=data, updated_at=time.time())
+    @property
+    def stale(self) -> bool:
+        """True while any schedule is still the warm-start copy (the slate may be out of date)."""
+        return any(entry.restored for entry in self.schedules.values())
 
     # ── Readers (called by provider) ────────────────────────────────
 
@@ -46,11 +201,38 @@ class SRCache:
 
     def get_summary(self, game_id: str) -> dict | None:
         entry = self.summaries.get(game_id)
-        return entry.data if entry else None
+        if entry is None:
+            return None
+        entry.accessed_at = time.time()
+        return entry.data
 
     def get_pbp_data(self, game_id: str) -> dict | None:
         entry = self.pbp.get(game_id)
-        return entry.data if entry else None
+        if entry is None:
+            return None
+        entry.accessed_at = time.time()
+        return entry.data
+
+    def get_game(self, game_id: str) -> GameRef | None:
+        """Index entry for a game. Not a read for eviction: callers that serve it ``touch`` it."""
+        return self._games.get(game_id)
+
+    def touch(self, ref: GameRef, pbp: bool = True):
+        """Mark the game's summary (and PBP) as just served, for TTL and LRU eviction."""
+        now = time.time()
+        if ref.summary is not None:
+            ref.summary.accessed_at = now
+        if pbp and ref.pbp is not None:
+            ref.pbp.accessed_at = now
+
+    def find_game(self, game_id: str) -> tuple[str, dict] | None:
+        """(sport, schedule entry) for a game, or None if no schedule lists it."""
+        ref = self._games.get(game_id)
+        return (ref.sport, ref.schedule) if ref else None
+
+    def sport_for_game(self, game_id: str) -> str | None:
+        ref = self._games.get(game_id)
+        return ref.sport if ref else None
 
     def get_schedule_age(self, sport: str) -> float:
         entry = self.schedules.get(sport)
@@ -59,24 +241,87 @@ class SRCache:
     # ── Live game tracking ──────────────────────────────────────────
 
     def get_live_game_ids(self) -> list[str]:
-        """Return game IDs from schedules that are currently in-progress."""
-        live = []
-        for sport, entry in self.schedules.items():
-            for game in entry.data.get("games", []):
-                status = game.get("status", "")
-                if status in ("inprogress", "halftime"):
-                    live.append(game.get("id", ""))
-        return [g for g in live if g]
+        """Return game IDs from schedules that are currently in-progress (precomputed)."""
+        return self._live_ids
 
     def get_all_game_ids(self) -> list[str]:
-        """Return all game IDs from today's schedules."""
-        ids = []
-        for sport, entry in self.schedules.items():
-            for game in entry.data.get("games", []):
-                gid = game.get("id", "")
-                if gid:
-                    ids.append(gid)
-        return ids
+        """Return all game IDs from today's schedules (precomputed)."""
+        return self._all_ids
+
+    # ── Eviction ────────────────────────────────────────────────────
+
+    def add_evict_listener(self, listener: Callable[[str, str], None]):
+        self._evict_listeners.append(listener)
+
+    def _is_final(self, game_id: str) -> bool:
+        ref = self._games.get(game_id)
+        if ref is None:
+            return True  # no longer on any schedule (yesterday's slate)
+        summary = ref.summary.data if ref.summary else {}
+        return summary.get("status", ref.schedule.get("status", "")) in _FINAL_STATUSES
+
+    def _ttl(self, kind: str, game_id: str) -> float | None:
+        """Idle seconds after which an entry expires; None keeps it until memory pressure."""
+        final = self._is_final(game_id)
+        if kind == "pbp":
+            return config.SR_CACHE_PBP_FINAL_TTL if final else config.SR_CACHE_PBP_TTL
+        return config.SR_CACHE_SUMMARY_FINAL_TTL if final else None
+
+    def _evict(self, kind: str, game_id: str) -> bool:
+        if self.is_watched is not None and self.is_watched(kind, game_id):
+            self.refused += 1
+            return False
+        store = self.pbp if kind == "pbp" else self.summaries
+        entry = store.pop(game_id, None)
+        if entry is None:
+            return False
+        self.bytes -= entry.size
+        ref = self._games.get(game_id)
+        if ref is not None:
+            setattr(ref, kind, None)
+        self.evictions[kind] += 1
+        for listener in self._evict_listeners:
+            listener(kind, game_id)
+        return True
+
+    def sweep(self) -> int:
+        """Expire idle entries, then evict LRU ones while over ``max_bytes``. Returns evictions."""
+        now = self._swept_at = time.time()
+        evicted = 0
+        candidates = []
+        for kind, store in (("pbp", self.pbp), ("summary", self.summaries)):
+            for game_id, entry in list(store.items()):
+                ttl = self._ttl(kind, game_id)
+                if ttl is not None and now - entry.accessed_at > ttl and self._evict(kind, game_id):
+                    evicted += 1
+                else:
+                    candidates.append((entry.accessed_at, kind, game_id))
+
+        if self.bytes > self.max_bytes:
+            # Down to 90% so we aren't back here on the next write
+            target = self.max_bytes * 0.9
+            candidates.sort()
+            for _, kind, game_id in candidates:
+                if self.bytes <= target:
+                    break
+                evicted += self._evict(kind, game_id)
+            if self.bytes > self.max_bytes:
+                log.warning("SR cache over its ceiling (%d > %d bytes) — remaining entries are watched",
+                            self.bytes, self.max_bytes)
+        return evicted
+
+    def stats(self) -> dict:
+        return {
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "schedules": len(self.schedules),
+            "summaries": len(self.summaries),
+            "pbp": len(self.pbp),
+            "evictions": dict(self.evictions),
+            "refused": self.refused,
+            "restored_at": self.restored_at,
+            "stale": self.stale,
+        }
 
     # ── PBP demand tracking ─────────────────────────────────────────
 
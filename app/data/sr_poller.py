@@ -100,7 +100,7 @@ class SRPoller:
         for game_id in cache.get_live_game_ids():
             game = reader.get_sportradar_game(game_id)
             if game and game.game_data_json != "{}":
-                cache.set_summary(game_id, json.loads(game.game_data_json))
+                cache.set_summary(game_id, json.loads(game.game_data_json), size=len(game.game_data_json))
 
     def _load_missing_summaries(self):
         """Load summaries for games not yet in cache (completed/scheduled).
@@ -113,21 +113,13 @@ class SRPoller:
                 continue
             game = reader.get_sportradar_game(game_id)
             if game and game.game_data_json != "{}":
-                cache.set_summary(game_id, json.loads(game.game_data_json))
+                cache.set_summary(game_id, json.loads(game.game_data_json), size=len(game.game_data_json))
 
     # ── PBP (still direct API call) ────────────────────────────────
 
-    def _sport_for_game(self, game_id: str) -> str | None:
-        """Look up which sport a game_id belongs to."""
-        for sport, entry in cache.schedules.items():
-            for game in entry.data.get("games", []):
-                if game.get("id") == game_id:
-                    return sport
-        return None
-
     async def _fetch_pbp(self, game_id: str):
         """Fetch PBP from SR API (unchanged — still direct API call)."""
-        sport = self._sport_for_game(game_id)
+        sport = cache.sport_for_game(game_id)
         if not sport:
             return
         if not await self.limiter.acquire():
@@ -137,7 +129,7 @@ class SRPoller:
         try:
             resp = await self.client.get(url, params={"api_key": config.SPORTRADAR_API_KEY})
             if resp.status_code == 200:
-                cache.set_pbp(game_id, resp.json())
+                cache.set_pbp(game_id, resp.json(), size=len(resp.content))
             elif resp.status_code == 429:
                 log.warning("PBP 429 rate limited — backing off 60s")
                 await asyncio.sleep(60)
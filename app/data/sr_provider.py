@@ -5,9 +5,13 @@ Handles both NBA (4 quarters) and NCAAMB (2 halves) period structures.
 """
 
 from datetime import datetime, timezone
+from types import MappingProxyType
 
-from .provider import DataProvider, GameSummary, GameDetail, PlayerStats, PlayEvent
-from .sr_cache import cache
+from .pbp_store import pbp_store
+from .provider import (
+    DataProvider, GameSummary, GameDetail, PbpPage, PlayerStats, PlayEvent, UnknownCursor,
+)
+from .sr_cache import GameRef, cache
 
 
 # SR status → our status
@@ -62,14 +66,40 @@ def _get_period_and_clock(game: dict) -> tuple[int, str]:
     return period, clock or ""
 
 
-def _game_sport(game_id: str) -> str:
-    """Determine sport by checking which schedule contains this game."""
-    for sport in cache.schedules:
-        entry = cache.schedules[sport]
-        for g in entry.data.get("games", []):
-            if g.get("id") == game_id:
-                return sport
-    return "nba"
+class _MappingCache:
+    """Mapped models memoized by the versions of the cache entries they came from.
+
+    Keyed per game by (schedule version, summary version[, pbp version]); a
+    hit costs a dict lookup and a tuple compare. Results are frozen, so HTTP
+    handlers, page renders and broadcasts all share the same objects.
+    """
+
+    def __init__(self):
+        self.summaries: dict[str, tuple[tuple, GameSummary]] = {}
+        self.details: dict[str, tuple[tuple, GameDetail]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def discard(self, game_id: str):
+        self.summaries.pop(game_id, None)
+        self.details.pop(game_id, None)
+
+
+_mapped = _MappingCache()
+
+
+def _on_cache_evict(kind: str, game_id: str):
+    # Mapped models and parsed PBP would otherwise keep the evicted payload's data alive
+    _mapped.discard(game_id)
+    if kind == "pbp":
+        pbp_store.discard(game_id)
+
+
+cache.add_evict_listener(_on_cache_evict)
+
+
+def _entry_version(entry) -> int:
+    return entry.version if entry is not None else 0
 
 
 class SRProvider(DataProvider):
@@ -79,118 +109,172 @@ class SRProvider(DataProvider):
         sports = [sport] if sport != "all" else list(cache.schedules.keys())
 
         for sp in sports:
-            schedule = cache.get_schedule(sp)
-            if not schedule:
+            entry = cache.schedules.get(sp)
+            if not entry:
                 continue
-            for game in schedule.get("games", []):
-                gid = game.get("id", "")
-                sr_status = game.get("status", "scheduled")
-                our_status = _map_status(sr_status)
-
-                # Try to get richer data from summary cache
-                summary = cache.get_summary(gid)
-                if summary:
-                    home_score, away_score, period, clock = self._scores_from_summary(summary)
-                    # Update status from summary if available
-                    sum_status = summary.get("status", sr_status)
-                    our_status = _map_status(sum_status)
+            for game in entry.data.get("games", []):
+                ref = cache.get_game(game.get("id", ""))
+                if ref is not None and ref.schedule is game:
+                    cache.touch(ref, pbp=False)
+                    results.append(self._summary_for(ref))
                 else:
-                    home_score = game.get("home_points", 0) or 0
-                    away_score = game.get("away_points", 0) or 0
-                    period, clock = _get_period_and_clock(game)
-
-                home_team = game.get("home", {}).get("name", "TBD")
-                away_team = game.get("away", {}).get("name", "TBD")
-                start_time = _format_start_time(game.get("scheduled", ""))
-
-                results.append(GameSummary(
-                    game_id=gid,
-                    sport=sp,
-                    status=our_status,
-                    home_team=home_team,
-                    away_team=away_team,
-                    home_score=home_score,
-                    away_score=away_score,
-                    period=period,
-                    clock=clock,
-                    start_time=start_time,
-                ))
+                    # No id (or listed twice) — not indexed, map without memo
+                    summary_entry = cache.summaries.get(game.get("id", ""))
+                    results.append(self._map_summary(
+                        game.get("id", ""), sp, game, summary_entry.data if summary_entry else None,
+                    ))
         return results
 
     async def get_game(self, game_id: str) -> GameDetail | None:
         # Signal that we want PBP for this game (demand-driven)
         cache.request_pbp(game_id)
+        if (ref := cache.get_game(game_id)) is not None:
+            cache.touch(ref)
+        return self._detail(game_id)
 
-        # Build summary from schedule + summary cache
-        game_data = self._find_game_in_schedule(game_id)
-        if not game_data:
+    async def get_game_status(self, game_id: str) -> str | None:
+        ref = cache.get_game(game_id)
+        if not ref:
+            return None
+        # A revalidation is still a viewer, so keep the PBP demand alive
+        cache.request_pbp(game_id)
+        cache.touch(ref)
+        return self._summary_for(ref).status
+
+    async def get_games(self, game_ids, include_pbp: bool = True) -> dict[str, GameDetail | None]:
+        games = {}
+        for game_id in game_ids:
+            if include_pbp:
+                cache.request_pbp(game_id)
+            if (ref := cache.get_game(game_id)) is not None:
+                cache.touch(ref, pbp=include_pbp)
+            games[game_id] = self._detail(game_id)
+        return games
+
+    def _detail(self, game_id: str) -> GameDetail | None:
+        # Build summary from schedule + summary cache (one index lookup)
+        ref = cache.get_game(game_id)
+        if not ref:
             return None
 
-        sport, sched_game = game_data
-        summary_data = cache.get_summary(game_id)
+        key = (
+            ref.schedule_version,
+            _entry_version(ref.summary),
+            _entry_version(ref.pbp),
+        )
+        memo = _mapped.details.get(game_id)
+        if memo is not None and memo[0] == key:
+            _mapped.hits += 1
+            return memo[1]
+        _mapped.misses += 1
 
-        sr_status = (summary_data or sched_game).get("status", "scheduled")
-        our_status = _map_status(sr_status)
+        summary_data = ref.summary.data if ref.summary else None
 
-        if summary_data:
-            home_score, away_score, period, clock = self._scores_from_summary(summary_data)
-        else:
-            home_score = sched_game.get("home_points", 0) or 0
-            away_score = sched_game.get("away_points", 0) or 0
-            period, clock = _get_period_and_clock(sched_game)
+        # Extract players from summary
+        home_players, away_players = self._extract_players(summary_data) if summary_data else ([], [])
+
+        # Extract PBP (incremental, newest-first view — no copy)
+        pbp_data = ref.pbp.data if ref.pbp else None
+        play_by_play = pbp_store.get(game_id, pbp_data).newest_first() if pbp_data else ()
+
+        # Extract team stats
+        home_stats, away_stats = self._extract_team_stats(summary_data) if summary_data else ({}, {})
 
-        home_team = sched_game.get("home", {}).get("name", "TBD")
-        away_team = sched_game.get("away", {}).get("name", "TBD")
-        start_time = _format_start_time(sched_game.get("scheduled", ""))
+        detail = GameDetail(
+            summary=self._summary_for(ref),
+            home_players=tuple(home_players),
+            away_players=tuple(away_players),
+            play_by_play=play_by_play,
+            home_team_stats=MappingProxyType(home_stats),
+            away_team_stats=MappingProxyType(away_stats),
+        )
+        _mapped.details[game_id] = (key, detail)
+        return detail
+
+    def _summary_for(self, ref: GameRef) -> GameSummary:
+        key = (ref.schedule_version, _entry_version(ref.summary))
+        game_id = ref.schedule.get("id", "")
+        memo = _mapped.summaries.get(game_id)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        summary = self._map_summary(game_id, ref.sport, ref.schedule, ref.summary.data if ref.summary else None)
+        _mapped.summaries[game_id] = (key, summary)
+        return summary
 
-        summary = GameSummary(
+    @staticmethod
+    def _map_summary(game_id: str, sport: str, game: dict, summary: dict | None) -> GameSummary:
+        sr_status = game.get("status", "scheduled")
+
+        # Prefer richer data from the summary cache
+        if summary:
+            home_score, away_score, period, clock = SRProvider._scores_from_summary(summary)
+            our_status = _map_status(summary.get("status", sr_status))
+        else:
+            home_score = game.get("home_points", 0) or 0
+            away_score = game.get("away_points", 0) or 0
+            period, clock = _get_period_and_clock(game)
+            our_status = _map_status(sr_status)
+
+        return GameSummary(
             game_id=game_id,
             sport=sport,
             status=our_status,
-            home_team=home_team,
-            away_team=away_team,
+            home_team=game.get("home", {}).get("name", "TBD"),
+            away_team=game.get("away", {}).get("name", "TBD"),
             home_score=home_score,
             away_score=away_score,
             period=period,
             clock=clock,
-            start_time=start_time,
+            start_time=_format_start_time(game.get("scheduled", "")),
         )
 
-        # Extract players from summary
-        home_players, away_players = self._extract_players(summary_data) if summary_data else ([], [])
-
-        # Extract PBP
+    async def get_play_by_play(self, game_id: str) -> list[PlayEvent]:
+        cache.request_pbp(game_id)
         pbp_data = cache.get_pbp_data(game_id)
-        play_by_play = self._extract_pbp(pbp_data, sport) if pbp_data else []
-
-        # Extract team stats
-        home_stats, away_stats = self._extract_team_stats(summary_data) if summary_data else ({}, {})
+        if not pbp_data:
+            return []
+        return pbp_store.get(game_id, pbp_data).newest_first()
 
-        return GameDetail(
-            summary=summary,
-            home_players=home_players,
-            away_players=away_players,
-            play_by_play=play_by_play,
-            home_team_stats=home_stats,
-            away_team_stats=away_stats,
+    async def get_play_by_play_page(self, game_id: str, since_event_id: str | None = None,
+                                    before_event_id: str | None = None,
+                                    limit: int | None = None) -> PbpPage:
+        """Served from the indexed per-game event store, in seq order."""
+        cache.request_pbp(game_id)
+        pbp_data = cache.get_pbp_data(game_id)
+        if not pbp_data:
+            if since_event_id or before_event_id:
+                raise UnknownCursor(since_event_id or before_event_id)
+            return PbpPage((), False, -1)
+        game = pbp_store.get(game_id, pbp_data)
+
+        def seq(event_id: str) -> int:
+            found = game.seq_of(event_id)
+            if found is None:
+                raise UnknownCursor(event_id)
+            return found
+
+        events, has_more = game.page(
+            seq(since_event_id) if since_event_id else -1,
+            seq(before_event_id) if before_event_id else None,
+            limit,
         )
+        return PbpPage(events, has_more, game.last_seq)
 
-    async def get_play_by_play(self, game_id: str) -> list[PlayEvent]:
-        cache.request_pbp(game_id)
+    async def get_play_by_play_since(self, game_id: str, after_seq: int) -> list[PlayEvent]:
+        """Events first seen after the ``after_seq`` cursor, oldest first."""
         pbp_data = cache.get_pbp_data(game_id)
         if not pbp_data:
             return []
-        sport = _game_sport(game_id)
-        return self._extract_pbp(pbp_data, sport)
+        return pbp_store.get(game_id, pbp_data).since(after_seq)
 
-    # ── Internal helpers ────────────────────────────────────────────
+    async def get_pbp_last_seq(self, game_id: str) -> int:
+        """Newest PBP seq we hold for the game, -1 if none."""
+        pbp_data = cache.get_pbp_data(game_id)
+        if not pbp_data:
+            return -1
+        return pbp_store.get(game_id, pbp_data).last_seq
 
-    def _find_game_in_schedule(self, game_id: str) -> tuple[str, dict] | None:
-        for sport, entry in cache.schedules.items():
-            for game in entry.data.get("games", []):
-                if game.get("id") == game_id:
-                    return sport, game
-        return None
+    # ── Internal helpers ────────────────────────────────────────────
 
     @staticmethod
     def _scores_from_summary(summary: dict) -> tuple[int, int, int, str]:
@@ -240,53 +324,6 @@ class SRProvider(DataProvider):
                 ))
         return home_players, away_players
 
-    @staticmethod
-    def _extract_pbp(pbp_data: dict, sport: str) -> list[PlayEvent]:
-        """Extract play-by-play events from SR PBP response."""
-        events = []
-        event_id = 0
-        periods = pbp_data.get("periods", [])
-
-        for per in periods:
-            period_num = per.get("number", 0)
-            for event in per.get("events", []):
-                desc = event.get("description", "")
-                if not desc:
-                    continue
-                clock = event.get("clock", "")
-                # Try to determine team
-                team = ""
-                attribution = event.get("attribution", {})
-                if attribution:
-                    team = attribution.get("market", attribution.get("name", ""))[:3].upper()
-
-                # Running score
-                home_score = event.get("home_points", 0) or 0
-                away_score = event.get("away_points", 0) or 0
-
-                # Player name
-                player = ""
-                if event.get("statistics"):
-                    stat = event["statistics"][0] if event["statistics"] else {}
-                    player_info = stat.get("player", {})
-                    player = player_info.get("full_name", "")
-
-                events.append(PlayEvent(
-                    event_id=event_id,
-                    clock=clock,
-                    period=period_num,
-                    team=team,
-                    player=player,
-                    description=desc,
-                    home_score=home_score,
-                    away_score=away_score,
-                ))
-                event_id += 1
-
-        # Return most recent first
-        events.reverse()
-        return events
-
     @staticmethod
     def _extract_team_stats(summary: dict) -> tuple[dict, dict]:
         """Extract team-level stats from SR summary."""
@@ -0,0 +1,84 @@
+"""Conditional HTTP caching: ETags from data versions, Cache-Control by game state.
+
+ETags are derived from the realtime snapshot versions of the topics a
+response is built from. Those versions are backplane sequence numbers, so
+every worker gives the same state the same ETag; the backplane epoch in
+each version keeps a restarted sequence from reusing old ETags. When the
+data is not relay-driven (mock/DSG providers) there is no version and no
+ETag.
+"""
+
+import hashlib
+import time
+
+from fastapi import Request, Response
+
+from . import config
+from .data.sr_cache import cache
+
+_RELEASE = config.RELEASE or str(int(time.time()))
+
+
+def salt_etags(token: str):
+    """Fold ``token`` (e.g. the static asset fingerprint) into every ETag."""
+    global _RELEASE
+    _RELEASE = f"{_RELEASE}|{token}"
+
+
+def make_etag(kind: str, version: str | None) -> str | None:
+    """Weak ETag for response ``kind`` at data ``version`` (weak: compression may re-encode)."""
+    if version is None:
+        return None
+    digest = hashlib.blake2b(f"{_RELEASE}|{kind}|{version}".encode(), digest_size=10).hexdigest()
+    return f'W/"{digest}"'
+
+
+def cache_control(final: bool) -> str:
+    if final:
+        return f"public, max-age={config.FINAL_GAME_MAX_AGE}, immutable"
+    return config.CACHE_CONTROL_LIVE
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): opaque tags compared without W/
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str | None, cc: str) -> Response | None:
+    """A 304 when the client already holds ``etag``, else None (build the body)."""
+    if etag is None:
+        return None
+    header = request.headers.get("if-none-match")
+    if header and _matches(header, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cc})
+    return None
+
+
+def with_validators(response: Response, etag: str | None, cc: str) -> Response:
+    response.headers["Cache-Control"] = cc
+    if etag is not None:
+        response.headers["ETag"] = etag
+    if cache.stale:
+        # Still serving the warm-start snapshot; value is its age in seconds
+        response.headers["X-Data-Stale"] = str(int(time.time() - cache.restored_at))
+    return response
+
+
+def preferred_encoding(accept_encoding: str | None, available) -> str | None:
+    """Best of ``available`` (in server preference order) that the client accepts, or None."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for token in accept_encoding.lower().split(","):
+        coding, _, params = token.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding.strip())
+    for coding in available:
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
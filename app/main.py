@@ -1,41 +1,105 @@
+import asyncio
 import logging
+import tempfile
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from . import config
 from .data.mock_provider import MockProvider
+from .data.shared_replica import ReplicaProvider, ReplicaReader, run_publisher
 from .data.dsg_provider import DSGProvider
+from .data.cache_snapshot import load_snapshot, run_snapshots
+from .data.sr_cache import cache
+from .http_cache import salt_etags
+from .realtime import manager
 from .routes import pages, api, ws
+from .static_assets import PrecompressedStaticFiles, build_static
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 
 # ── Lifespan ─────────────────────────────────────────────────────
 
 
+def _snapshot_path() -> Path | None:
+    if config.DATA_SOURCE != "sportradar" or config.CACHE_SNAPSHOT_PATH == "off":
+        return None
+    return Path(config.CACHE_SNAPSHOT_PATH or Path(tempfile.gettempdir()) / "lsl-cache.sqlite")
+
+
+def _replica_path() -> Path | None:
+    if config.DATA_SOURCE != "sportradar" or config.BACKPLANE != "memory":
+        return None  # with a real backplane every worker gets every frame
+    if config.SHARED_REPLICA == "0" or (config.SHARED_REPLICA == "auto" and config.WEB_CONCURRENCY <= 1):
+        return None
+    if config.SHARED_REPLICA == "auto":
+        # The replica only covers HTTP: browser pushes and PBP requests on the
+        # other workers never reach the relay without a shared backplane
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={config.WEB_CONCURRENCY} needs BACKPLANE=redis for live updates on every "
+            "worker; set SHARED_REPLICA=1 to run the extra workers as HTTP-only replicas instead"
+        )
+    logging.getLogger("main").warning(
+        "Shared replica on: workers without the relay serve HTTP only (no live pushes or PBP requests)"
+    )
+    if config.SHARED_REPLICA_PATH:
+        return Path(config.SHARED_REPLICA_PATH)
+    shm = Path("/dev/shm")
+    return (shm if shm.is_dir() else Path(tempfile.gettempdir())) / "lsl-replica"
+
+
+def _is_primary() -> bool:
+    return manager.relay_is_connected
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    snapshot_task = None
+    replica_task = None
     if config.DATA_SOURCE == "sportradar":
         logging.getLogger("main").info(
             "Relay mode — waiting for relay WebSocket connection"
         )
+        if (path := _snapshot_path()) is not None:
+            # Serve the last known state right away; live frames replace it as they arrive
+            load_snapshot(cache, path, config.CACHE_SNAPSHOT_MAX_AGE)
+            snapshot_task = asyncio.create_task(run_snapshots(cache, path, config.CACHE_SNAPSHOT_INTERVAL))
+    if isinstance(provider, ReplicaProvider):
+        replica_task = asyncio.create_task(run_publisher(
+            provider.local, provider.reader.path, config.SHARED_REPLICA_INTERVAL, _is_primary,
+        ))
+    await manager.start()
     yield
+    await manager.stop()
+    for task in (snapshot_task, replica_task):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
 
 
 app = FastAPI(title="The Live Sports Lounge", lifespan=lifespan)
 
 # ── Static files + templates ────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
+STATIC_BUILD_DIR = Path(config.STATIC_BUILD_DIR or Path(tempfile.gettempdir()) / "lsl-static")
+static_manifest = build_static(BASE_DIR / "static", STATIC_BUILD_DIR)
+salt_etags(static_manifest.fingerprint)  # rendered pages embed the hashed asset URLs
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=STATIC_BUILD_DIR, manifest=static_manifest),
+    name="static",
+)
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
+templates.env.globals["static_url"] = static_manifest.url
 
 # ── Data provider ───────────────────────────────────────────────────
 if config.DATA_SOURCE == "sportradar" and config.SPORTRADAR_API_KEY:
     from .data.sr_provider import SRProvider
     provider = SRProvider()
+    if (replica_path := _replica_path()) is not None:
+        provider = ReplicaProvider(provider, ReplicaReader(replica_path), _is_primary)
 elif config.DATA_SOURCE == "dsg" and config.DSG_API_KEY:
     provider = DSGProvider(api_key=config.DSG_API_KEY)
 else:
@@ -0,0 +1,126 @@
+"""LRU of rendered HTML pages, keyed by (template, sport/game id, data version).
+
+Pages only change when the data behind them does, so a page is rendered
+once per data version and served from memory after that. Each entry can
+carry pre-compressed gzip/brotli variants (brotli only if the ``brotli``
+package is installed), so a hit is a plain bytes copy.
+
+Only one version per (template, discriminator) is kept: storing a newer
+version drops the older one. Memory is bounded by entry count and by the
+total size of all variants.
+"""
+
+import gzip
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from fastapi import Request, Response
+
+from . import config
+from .http_cache import preferred_encoding
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+
+@dataclass
+class RenderedPage:
+    # encoding ("identity", "br", "gzip") -> body
+    bodies: dict[str, bytes] = field(default_factory=dict)
+    media_type: str = "text/html"
+
+    @property
+    def size(self) -> int:
+        return sum(len(b) for b in self.bodies.values())
+
+    def response(self, request: Request) -> Response:
+        coding = preferred_encoding(
+            request.headers.get("accept-encoding"),
+            [c for c in ("br", "gzip") if c in self.bodies],
+        )
+        headers = {"Vary": "Accept-Encoding"}
+        if coding:
+            headers["Content-Encoding"] = coding
+        return Response(self.bodies[coding or "identity"], media_type=self.media_type, headers=headers)
+
+
+class PageCache:
+    def __init__(self, max_entries: int, max_bytes: int, encodings=("br", "gzip")):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.encodings = [e for e in encodings if e == "gzip" or (e == "br" and brotli is not None)]
+        self._pages: OrderedDict[tuple, RenderedPage] = OrderedDict()
+        # (template, discriminator) -> key of the version currently held
+        self._latest: dict[tuple, tuple] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> RenderedPage | None:
+        page = self._pages.get(key)
+        if page is None:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return page
+
+    def put(self, key: tuple, body: bytes, media_type: str = "text/html") -> RenderedPage:
+        page = RenderedPage({"identity": body}, media_type)
+        if "br" in self.encodings:
+            page.bodies["br"] = brotli.compress(body, quality=5)
+        if "gzip" in self.encodings:
+            page.bodies["gzip"] = gzip.compress(body, compresslevel=6)
+
+        if page.size > self.max_bytes:
+            return page  # serve it, but never cache something bigger than the whole budget
+        stale = self._latest.get(key[:-1])
+        if stale is not None:
+            self._drop(stale)
+        self._drop(key)
+        self._pages[key] = page
+        self._latest[key[:-1]] = key
+        self.bytes += page.size
+        while self._pages and (len(self._pages) > self.max_entries or self.bytes > self.max_bytes):
+            old_key, _ = next(iter(self._pages.items()))
+            self._drop(old_key)
+            self.evictions += 1
+        return page
+
+    def _drop(self, key: tuple):
+        page = self._pages.pop(key, None)
+        if page is None:
+            return
+        self.bytes -= page.size
+        if self._latest.get(key[:-1]) == key:
+            del self._latest[key[:-1]]
+
+    def clear(self):
+        self._pages.clear()
+        self._latest.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._pages),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "encodings": self.encodings,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+# Module-level singleton
+page_cache = PageCache(
+    max_entries=config.PAGE_CACHE_MAX_ENTRIES,
+    max_bytes=config.PAGE_CACHE_MAX_BYTES,
+    encodings=[e.strip() for e in config.PAGE_CACHE_ENCODINGS.split(",") if e.strip()],
+)
@@ -4,28 +4,445 @@ import asyncio
 import json
 import logging
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
 
 from fastapi import WebSocket
+from relay.codec import BatchDecoder
 
+from . import config
+from .backplane import create_backplane
+from .data.encoding import json_array, json_message
 from .data.sr_cache import cache
 from .data.sr_provider import SRProvider
 
 log = logging.getLogger("realtime")
 
 
+def _score_changed(prev: dict | None, data: dict) -> bool:
+    if prev is None:
+        return False
+    for side in ("home", "away"):
+        if prev.get(side, {}).get("points") != data.get(side, {}).get("points"):
+            return True
+    return False
+
+
+def scoreboard_topic(sport: str) -> str:
+    return "scoreboard" if sport == "all" else f"scoreboard:{sport}"
+
+
+@dataclass
+class Snapshot:
+    version: int
+    payload: str
+    # Per-item state the payload was built from (scoreboard: game_id -> encoded game),
+    # kept so the next broadcast can be sent as a delta against it
+    state: dict | None = None
+
+
+class SnapshotStore:
+    """Per-topic cache of already-encoded broadcast payloads.
+
+    Every topic holds at most one payload, tagged with a monotonically
+    increasing version. Relay writes invalidate only the topics they touch;
+    the next reader rebuilds and encodes the payload once, and every
+    broadcast and new subscriber after that shares the cached string.
+    """
+
+    def __init__(self, builder: Callable[[str, int], Awaitable[Snapshot | None]]):
+        self._builder = builder
+        self._snapshots: dict[str, Snapshot] = {}
+        # topic -> version of the latest write that touched it
+        self._versions: dict[str, int] = {}
+        self._clock = 0
+        # topic -> in-flight build, so concurrent readers share one rebuild
+        self._building: dict[str, asyncio.Future] = {}
+
+    def invalidate(self, topics, version: int | None = None) -> int:
+        """Drop cached payloads for ``topics`` and bump their version.
+
+        ``version`` lets the caller supply the version (the backplane sequence
+        number), so every worker tags the same state with the same version.
+        """
+        self._clock = max(self._clock + 1, version or 0)
+        for topic in topics:
+            self._versions[topic] = self._clock
+            self._snapshots.pop(topic, None)
+        return self._clock
+
+    def forget(self, topics) -> int:
+        """Drop payload and version for ``topics`` (their source is gone). Returns how many were held.
+
+        A forgotten topic reads as the current clock, so its version never goes back.
+        """
+        dropped = 0
+        for topic in topics:
+            self._snapshots.pop(topic, None)
+            if self._versions.pop(topic, None) is not None:
+                dropped += 1
+        return dropped
+
+    def prune(self, keep: Callable[[str], bool]) -> int:
+        """``forget`` every topic ``keep`` rejects. Returns how many were dropped."""
+        return self.forget([t for t in self._versions if not keep(t)])
+
+    def reset(self):
+        """Forget every payload and version (the version sequence started over)."""
+        self._snapshots.clear()
+        self._versions.clear()
+        self._clock = 0
+
+    def version(self, topic: str) -> int:
+        # Read-only: topics only get an entry when a write touches them, so
+        # clients naming arbitrary topics can't grow this map
+        return self._versions.get(topic, self._clock)
+
+    def peek_version(self, topic: str) -> int | None:
+        """Version of ``topic`` without pinning it; None before any write at all."""
+        if not self._clock:
+            return None
+        return self._versions.get(topic, self._clock)
+
+    async def get(self, topic: str) -> Snapshot | None:
+        version = self.version(topic)
+        snap = self._snapshots.get(topic)
+        if snap is not None and snap.version == version:
+            return snap
+
+        pending = self._building.get(topic)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._building[topic] = fut
+        try:
+            snap = await self._builder(topic, version)
+            # Only keep it if no write landed while we were building (never-written
+            # topics aren't kept: their version moves with every write)
+            if snap is not None and self._versions.get(topic) == version:
+                self._snapshots[topic] = snap
+            fut.set_result(snap)
+            return snap
+        except BaseException as e:
+            fut.set_exception(e)
+            # Nobody else may be waiting — don't leave the error unretrieved
+            fut.exception()
+            raise
+        finally:
+            self._building.pop(topic, None)
+
+
+class BrowserConnection:
+    """One browser socket with its own writer task and bounded outbound queue.
+
+    Pending messages are keyed by topic: a newer payload for a topic that is
+    still waiting replaces the older one in place, so a slow client skips
+    intermediate states instead of buffering them. ``lag`` is how long the
+    oldest unsent message has been waiting.
+    """
+
+    def __init__(self, ws: WebSocket, max_pending: int, timeout: float):
+        self.ws = ws
+        self.max_pending = max_pending
+        self.timeout = timeout
+        # topic -> (payload, first enqueued_at)
+        self._pending: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        # Reverse index: topics this socket is subscribed to
+        self.topics: set[str] = set()
+        self.closed = False
+        self.stalled = False
+        self.evicting = False
+        self.sent = 0
+        self.conflated = 0
+
+    @property
+    def lag(self) -> float:
+        if not self._pending:
+            return 0.0
+        _, enqueued_at = next(iter(self._pending.values()))
+        return time.monotonic() - enqueued_at
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, topic: str, payload: str, full: str | None = None) -> bool:
+        """Queue ``payload`` for sending. Returns False if the client is too far behind.
+
+        ``full`` is the complete-state equivalent of a delta ``payload``; it is
+        queued instead when an older message for the topic is still pending,
+        since two deltas can't simply replace one another.
+        """
+        if self.closed:
+            return True
+        if topic in self._pending:
+            _, enqueued_at = self._pending[topic]
+            self._pending[topic] = (full if full is not None else payload, enqueued_at)
+            self.conflated += 1
+        elif len(self._pending) >= self.max_pending:
+            return False
+        else:
+            self._pending[topic] = (payload, time.monotonic())
+        self._wakeup.set()
+        return self.lag <= self.timeout
+
+    async def run(self):
+        """Writer loop. Returns when the socket fails or a send stalls past the timeout."""
+        try:
+            while True:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, (payload, _) = self._pending.popitem(last=False)
+                await asyncio.wait_for(self.ws.send_text(payload), timeout=self.timeout)
+                self.sent += 1
+        except asyncio.TimeoutError:
+            self.stalled = True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        finally:
+            self.closed = True
+            self._pending.clear()
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed = True
+        try:
+            await self.ws.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
+class BroadcastScheduler:
+    """Coalesces dirty topics and flushes each at most once per tick.
+
+    A burst of relay messages touching the same topics turns into one
+    broadcast per topic at the next tick. Topics marked ``urgent`` (score
+    changes) can take a fast lane that flushes after a much shorter delay.
+    """
+
+    def __init__(self, flush: Callable[[str], None], tick: float,
+                 fast_lane: bool = True, fast_tick: float = 0.025):
+        self._flush = flush
+        self.tick = tick
+        self.fast_lane = fast_lane
+        self.fast_tick = fast_tick
+        self._dirty: set[str] = set()
+        self._urgent: set[str] = set()
+        self._urgent_event = asyncio.Event()
+        self.marked = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.fast_flushed = 0
+
+    def mark(self, topic: str, urgent: bool = False):
+        self.marked += 1
+        if urgent and self.fast_lane:
+            if topic in self._urgent:
+                self.coalesced += 1
+            self._urgent.add(topic)
+            self._dirty.discard(topic)
+            self._urgent_event.set()
+        elif topic in self._dirty or topic in self._urgent:
+            self.coalesced += 1
+        else:
+            self._dirty.add(topic)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            if self._dirty:
+                topics, self._dirty = self._dirty, set()
+                self.flushed += len(topics)
+                for topic in topics:
+                    self._flush(topic)
+
+    async def run_fast_lane(self):
+        while True:
+            await self._urgent_event.wait()
+            # Short grace period so a burst of score changes still coalesces
+            await asyncio.sleep(self.fast_tick)
+            self._urgent_event.clear()
+            topics, self._urgent = self._urgent, set()
+            self.fast_flushed += len(topics)
+            for topic in topics:
+                self._flush(topic)
+
+    def stats(self) -> dict:
+        return {
+            "tick_ms": round(self.tick * 1000),
+            "fast_lane": self.fast_lane,
+            "dirty": len(self._dirty) + len(self._urgent),
+            "marked": self.marked,
+            "coalesced": self.coalesced,
+            "flushed": self.flushed,
+            "fast_flushed": self.fast_flushed,
+        }
+
+
+@dataclass
+class PipelineStats:
+    ingested: int = 0
+    ingest_queue_max: int = 0
+    ingest_lag_max: float = 0.0
+    ingest_lag_total: float = 0.0
+    broadcasts: int = 0
+    fanout_queue_max: int = 0
+    fanout_dropped: int = 0
+    slow_consumers_evicted: int = 0
+
+
 class ConnectionManager:
+    """Relay ingest → topic invalidation → browser fan-out.
+
+    Relay frames go onto a bounded ingest queue. A single ingest task applies
+    them to ``SRCache`` and marks the touched topics dirty with the broadcast
+    scheduler; each tick, a pool of fan-out workers broadcasts every dirty
+    topic once from the snapshot store. A slow
+    browser only ever holds up a fan-out worker, never the relay socket.
+    """
+
     def __init__(self):
         self.relay_ws: WebSocket | None = None
-        self._browsers: set[WebSocket] = set()
+        self._browsers: dict[WebSocket, BrowserConnection] = {}
         # topic -> set of browser websockets
+        # Subscription state is only mutated and iterated in synchronous code
+        # (no awaits in between), so the event loop already serialises it —
+        # no lock. _lock only guards swapping the relay socket.
         self._subscriptions: dict[str, set[WebSocket]] = {}
         self._lock = asyncio.Lock()
         self._provider = SRProvider()
+        self._snapshots = SnapshotStore(self._build_payload)
+        # Per-game topics go with the cached data they were built from
+        cache.add_evict_listener(self._on_cache_evict)
         self._relay_connected_at: float = 0.0
+        self._relay_decoder: BatchDecoder | None = None
+        self._backplane = create_backplane(config.BACKPLANE, config.BACKPLANE_URL, config.BACKPLANE_PREFIX,
+                                           config.BACKPLANE_START_TIMEOUT)
+        # (raw frame, backplane seq, enqueued_at) waiting to be applied to the cache
+        self._ingest_queue: asyncio.Queue = asyncio.Queue(maxsize=config.RELAY_INGEST_QUEUE_SIZE)
+        # Dirty topics waiting for a fan-out worker; each topic queued at most once
+        self._fanout_queue: asyncio.Queue = asyncio.Queue(maxsize=config.FANOUT_QUEUE_SIZE)
+        self._fanout_pending: set[str] = set()
+        self._fanout_inflight: set[str] = set()
+        self._fanout_rerun: set[str] = set()
+        # scoreboard topic -> last snapshot broadcast, the base for the next delta
+        self._delta_base: dict[str, Snapshot] = {}
+        # game_id -> newest PBP seq already streamed to subscribers
+        self._pbp_sent: dict[str, int] = {}
+        # sport -> relay revision of the schedule in the cache; schedule_patch frames name their base
+        self._schedule_revs: dict[str, int] = {}
+        # sports with a full-schedule request outstanding
+        self._schedule_resyncs: set[str] = set()
+        # fire-and-forget tasks (relay requests, evictions), held so they aren't collected mid-flight
+        self._control_tasks: set[asyncio.Task] = set()
+        self._scheduler = BroadcastScheduler(
+            self._mark_dirty,
+            tick=config.BROADCAST_TICK_MS / 1000,
+            fast_lane=config.BROADCAST_FAST_LANE,
+            fast_tick=config.BROADCAST_FAST_LANE_MS / 1000,
+        )
+        self._tasks: list[asyncio.Task] = []
+        self._fanout_workers = 0
+        self._stats = PipelineStats()
+
+    # ── Lifecycle ───────────────────────────────────────────────────
+
+    async def start(self):
+        if self._tasks:
+            return
+        cache.is_watched = self._is_watched
+        self._tasks.append(asyncio.create_task(self._ingest_loop()))
+        self._tasks.append(asyncio.create_task(self._cache_sweeper()))
+        await self._backplane.start(self._enqueue_relay_frame, self._handle_control_message,
+                                    self._on_backplane_reset)
+        self._tasks.append(asyncio.create_task(self._scheduler.run()))
+        self._tasks.append(asyncio.create_task(self._scheduler.run_fast_lane()))
+        self._fanout_workers = max(1, config.FANOUT_WORKERS)
+        for _ in range(self._fanout_workers):
+            self._tasks.append(asyncio.create_task(self._fanout_loop()))
+        log.info("Realtime pipeline started (%d fan-out workers, %dms tick)",
+                 self._fanout_workers, config.BROADCAST_TICK_MS)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._fanout_workers = 0
+        await self._backplane.stop()
+
+    def _on_backplane_reset(self):
+        # Old versions could repeat under the new epoch: drop them and every delta base built on them
+        self._snapshots.reset()
+        self._delta_base.clear()
+
+    # ── SR cache bounds ─────────────────────────────────────────────
+
+    def _on_cache_evict(self, kind: str, game_id: str):
+        if kind == "summary":
+            self._snapshots.forget([f"game:{game_id}"])
+        elif kind == "pbp":
+            # The game detail embeds the PBP too
+            self._snapshots.forget([f"game:{game_id}", f"pbp:{game_id}"])
+            self._pbp_sent.pop(game_id, None)
+
+    def _keep_snapshot(self, topic: str) -> bool:
+        """Per-game topics stay while the game is on a slate or watched."""
+        kind, _, game_id = topic.partition(":")
+        if kind not in ("game", "pbp"):
+            return True
+        return cache.sport_for_game(game_id) is not None or bool(self._subscribers(topic))
+
+    def _is_watched(self, kind: str, game_id: str) -> bool:
+        """Pin check for cache eviction: is a connected browser looking at this game's data?"""
+        if self._subscriptions.get(f"game:{game_id}"):
+            return True
+        if kind == "summary":
+            # Scoreboards only show the current slate; games on no schedule aren't pinned by them
+            sport = cache.sport_for_game(game_id)
+            if sport is None:
+                return False
+            return bool(self._subscriptions.get("scoreboard")
+                        or self._subscriptions.get(f"scoreboard:{sport}"))
+        return False
+
+    async def _cache_sweeper(self):
+        while True:
+            await asyncio.sleep(config.SR_CACHE_SWEEP_INTERVAL)
+            try:
+                evicted = cache.sweep()
+                if evicted:
+                    log.info("SR cache sweep evicted %d entries (%d bytes held)", evicted, cache.bytes)
+            except Exception:
+                log.exception("SR cache sweep failed")
+            self._snapshots.prune(self._keep_snapshot)
+            # The worker fed by the relay knows the current slate; it prunes the backplane's retained frames
+            if self.relay_ws is not None and cache.schedules:
+                try:
+                    pruned = await self._backplane.prune(self._keep_retained_frame)
+                    if pruned:
+                        log.info("Backplane pruned %d frames for games off the slate", pruned)
+                except Exception:
+                    log.exception("Backplane prune failed")
+
+    @staticmethod
+    def _keep_retained_frame(key: str) -> bool:
+        """Retained-frame keys are ``<type>:<sport|game_id>``; per-game ones go once the game leaves the slate."""
+        kind, _, ident = key.partition(":")
+        if kind in ("summary", "pbp"):
+            return cache.sport_for_game(ident) is not None
+        return True
 
     # ── Relay connection ────────────────────────────────────────────
 
-    async def connect_relay(self, ws: WebSocket):
+    async def connect_relay(self, ws: WebSocket, decoder: BatchDecoder | None = None):
         async with self._lock:
             if self.relay_ws is not None:
                 try:
@@ -33,8 +450,9 @@ class ConnectionManager:
                 except Exception:
                     pass
             self.relay_ws = ws
+            self._relay_decoder = decoder
             self._relay_connected_at = time.time()
-        log.info("Relay connected")
+        log.info("Relay connected (%s)", f"{decoder.codec} batches" if decoder else "JSON text")
 
     async def disconnect_relay(self, ws: WebSocket):
         async with self._lock:
@@ -50,38 +468,138 @@ class ConnectionManager:
     # ── Browser connections ─────────────────────────────────────────
 
     async def connect_browser(self, ws: WebSocket):
-        async with self._lock:
-            self._browsers.add(ws)
+        conn = BrowserConnection(ws, config.BROWSER_SEND_QUEUE_SIZE, config.SLOW_CONSUMER_TIMEOUT)
+        conn.task = asyncio.create_task(self._run_writer(conn))
+        self._browsers[ws] = conn
         log.debug("Browser connected (%d total)", len(self._browsers))
 
     async def disconnect_browser(self, ws: WebSocket):
-        async with self._lock:
-            self._browsers.discard(ws)
-            # Remove from all subscriptions
-            for topic_subs in self._subscriptions.values():
-                topic_subs.discard(ws)
+        conn = self._browsers.pop(ws, None)
+        if conn is None:
+            return
+        # Only the topics this socket joined — O(its topics), not O(all topics)
+        for topic in conn.topics:
+            self._remove_subscriber(topic, ws)
+        conn.topics.clear()
+        if conn.task is not None and conn.task is not asyncio.current_task():
+            conn.task.cancel()
         log.debug("Browser disconnected (%d remaining)", len(self._browsers))
 
+    async def _run_writer(self, conn: BrowserConnection):
+        await conn.run()
+        # Writer only returns on a failed or stalled send
+        if conn.ws not in self._browsers:
+            return
+        if conn.stalled:
+            if not conn.evicting:
+                conn.evicting = True
+                await self._evict(conn, "send timed out")
+        else:
+            await self.disconnect_browser(conn.ws)
+
+    async def _evict(self, conn: BrowserConnection, reason: str):
+        log.info("Evicting browser %s (%s, lag %.1fs, %d pending)",
+                 conn.ws.client, reason, conn.lag, conn.pending)
+        self._stats.slow_consumers_evicted += 1
+        await self.disconnect_browser(conn.ws)
+        await conn.close(code=1013, reason="slow consumer")
+
+    def send(self, ws: WebSocket, topic: str, payload: str, full: str | None = None):
+        """Queue ``payload`` on one browser's writer (evicts the client if it is too far behind)."""
+        conn = self._browsers.get(ws)
+        if conn is None:
+            return
+        if not conn.enqueue(topic, payload, full) and not (conn.evicting or conn.closed):
+            # Once per connection, however many sends overflow before it's gone
+            conn.evicting = True
+            task = asyncio.create_task(self._evict(conn, "too far behind"))
+            self._control_tasks.add(task)
+            task.add_done_callback(self._control_tasks.discard)
+
+    @staticmethod
+    def known_topic(topic: str) -> bool:
+        """Whether a browser may subscribe to ``topic``: scoreboards, or games the cache knows.
+
+        Until the first schedule arrives nothing can be judged, so game topics are let through.
+        """
+        if topic == "scoreboard":
+            return True
+        kind, _, ident = topic.partition(":")
+        if kind == "scoreboard":
+            return ident in cache.schedules or ident in [s.strip() for s in config.SR_SPORTS.split(",")]
+        if kind == "game" and ident:
+            return (not cache.schedules or cache.sport_for_game(ident) is not None
+                    or ident in cache.summaries)
+        return False
+
     async def subscribe(self, ws: WebSocket, topic: str):
-        async with self._lock:
-            if topic not in self._subscriptions:
-                self._subscriptions[topic] = set()
-            self._subscriptions[topic].add(ws)
+        if topic.startswith("game:") and not self._subscriptions.get(topic):
+            # Unwatched games aren't broadcast, so start the PBP cursor at what the
+            # store holds now; the subscriber gets everything before it via pbp_catchup
+            game_id = topic[5:]
+            self._pbp_sent[game_id] = await self._provider.get_pbp_last_seq(game_id)
+        conn = self._browsers.get(ws)
+        if conn is None:
+            return
+        self._subscriptions.setdefault(topic, set()).add(ws)
+        conn.topics.add(topic)
         log.debug("Browser subscribed to %s", topic)
 
     async def unsubscribe(self, ws: WebSocket, topic: str):
-        async with self._lock:
-            if topic in self._subscriptions:
-                self._subscriptions[topic].discard(ws)
+        conn = self._browsers.get(ws)
+        if conn is not None:
+            conn.topics.discard(topic)
+        self._remove_subscriber(topic, ws)
+
+    def _remove_subscriber(self, topic: str, ws: WebSocket):
+        subs = self._subscriptions.get(topic)
+        if subs is None:
+            return
+        subs.discard(ws)
+        if not subs:
+            # Drop empty game:<id> topics so the map doesn't grow all season
+            del self._subscriptions[topic]
+            if topic.startswith("game:"):
+                self._pbp_sent.pop(topic[5:], None)
 
     # ── Handle relay messages ───────────────────────────────────────
 
     async def handle_relay_message(self, raw: str):
+        """Publish a frame from our relay socket to every worker via the backplane."""
+        await self._backplane.publish_relay(raw)
+
+    async def _enqueue_relay_frame(self, seq: int, raw: str):
+        """Backplane delivery: queue a frame for ingest. Only waits if the queue is full."""
+        await self._ingest_queue.put((raw, seq, time.monotonic()))
+        depth = self._ingest_queue.qsize()
+        if depth > self._stats.ingest_queue_max:
+            self._stats.ingest_queue_max = depth
+
+    async def _ingest_loop(self):
+        while True:
+            raw, seq, enqueued_at = await self._ingest_queue.get()
+            lag = time.monotonic() - enqueued_at
+            self._stats.ingested += 1
+            self._stats.ingest_lag_total += lag
+            if lag > self._stats.ingest_lag_max:
+                self._stats.ingest_lag_max = lag
+            try:
+                topics, urgent = self._apply_relay_message(raw, seq)
+                for topic in topics:
+                    self._scheduler.mark(topic, urgent)
+            except Exception:
+                log.exception("Error applying relay message")
+
+    def _apply_relay_message(self, raw: str, seq: int) -> tuple[list[str], bool]:
+        """Write one relay frame into the cache.
+
+        Returns the topics to rebroadcast and whether the write changed a score.
+        """
         try:
             msg = json.loads(raw)
         except json.JSONDecodeError:
             log.warning("Invalid JSON from relay")
-            return
+            return [], False
 
         msg_type = msg.get("type")
 
@@ -89,23 +607,50 @@ class ConnectionManager:
             sport = msg.get("sport", "")
             data = msg.get("data", {})
             if sport and data:
-                cache.set_schedule(sport, data)
-                await self._broadcast_scoreboard()
+                topics = ["scoreboard", f"scoreboard:{sport}"]
+                touched = set(topics)
+                # Games added, dropped or changed by this schedule change their detail pages too
+                old = {g["id"]: g for g in (cache.get_schedule(sport) or {}).get("games", []) if g.get("id")}
+                for game in data.get("games", []):
+                    gid = game.get("id")
+                    if gid and old.pop(gid, None) != game:
+                        touched.add(f"game:{gid}")
+                touched.update(f"game:{gid}" for gid in old)
+                cache.set_schedule(sport, data, size=len(raw))
+                self._schedule_revs[sport] = msg.get("rev")
+                self._schedule_resyncs.discard(sport)
+                self._snapshots.invalidate(touched, seq)
+                return topics, False
+
+        elif msg_type == "schedule_patch":
+            sport = msg.get("sport", "")
+            if sport:
+                return self._apply_schedule_patch(sport, msg, seq)
 
         elif msg_type == "summary":
             game_id = msg.get("game_id", "")
             data = msg.get("data", {})
             if game_id and data:
-                cache.set_summary(game_id, data)
-                await self._broadcast_scoreboard()
-                await self._broadcast_game_update(game_id)
+                prev = cache.get_summary(game_id)
+                cache.set_summary(game_id, data, size=len(raw))
+                topics = ["scoreboard", f"game:{game_id}"]
+                sport = cache.sport_for_game(game_id)
+                if sport:
+                    # Only this game's sport slate changes
+                    topics.append(f"scoreboard:{sport}")
+                self._snapshots.invalidate(topics, seq)
+                return topics, _score_changed(prev, data)
 
         elif msg_type == "pbp":
             game_id = msg.get("game_id", "")
             data = msg.get("data", {})
             if game_id and data:
-                cache.set_pbp(game_id, data)
-                await self._broadcast_game_update(game_id)
+                cache.set_pbp(game_id, data, size=len(raw))
+                # PBP streams separately as pbp_append; game_update doesn't carry it.
+                # Versioned anyway: HTTP ETags for PBP and game pages depend on it.
+                topic = f"pbp:{game_id}"
+                self._snapshots.invalidate([topic], seq)
+                return [topic], False
 
         elif msg_type == "heartbeat":
             pass  # Keep-alive, no action needed
@@ -113,96 +658,292 @@ class ConnectionManager:
         else:
             log.debug("Unknown relay message type: %s", msg_type)
 
-    # ── Request PBP from relay ──────────────────────────────────────
+        return [], False
+
+    def _apply_schedule_patch(self, sport: str, msg: dict, seq: int) -> tuple[list[str], bool]:
+        """Apply per-game schedule changes on top of the schedule revision they were diffed from.
+
+        A patch for another base (a frame was missed, or this worker hydrated
+        from the backplane's latest-per-key state) is dropped and the relay is
+        asked for the full schedule; patches the cache is already past are ignored.
+        """
+        have = self._schedule_revs.get(sport)
+        base, rev = msg.get("base_rev"), msg.get("rev")
+        if have is not None and rev is not None and rev <= have:
+            return [], False
+        games = msg.get("games", [])
+        removed = msg.get("removed", [])
+        if have is None or base != have or not cache.patch_schedule(sport, games, removed):
+            self._request_schedule(sport)
+            return [], False
+        self._schedule_revs[sport] = rev
+        topics = ["scoreboard", f"scoreboard:{sport}"]
+        touched = set(topics)
+        touched.update(f"game:{g['id']}" for g in games if g.get("id"))
+        touched.update(f"game:{gid}" for gid in removed)
+        self._snapshots.invalidate(touched, seq)
+        return topics, False
+
+    def _request_schedule(self, sport: str):
+        if sport in self._schedule_resyncs:
+            return
+        self._schedule_resyncs.add(sport)
+        log.info("Schedule patch for %s doesn't apply — requesting full schedule", sport)
+        task = asyncio.get_running_loop().create_task(
+            self._send_control(json.dumps({"type": "request_schedule", "sport": sport}))
+        )
+        self._control_tasks.add(task)
+        task.add_done_callback(self._control_tasks.discard)
+
+    # ── Fan-out ─────────────────────────────────────────────────────
+
+    def _subscribers(self, topic: str) -> set[WebSocket] | None:
+        """Sockets that receive ``topic``. ``pbp:<id>`` streams to ``game:<id>`` subscribers."""
+        if topic.startswith("pbp:"):
+            topic = "game:" + topic[4:]
+        return self._subscriptions.get(topic)
+
+    def _mark_dirty(self, topic: str):
+        if topic in self._fanout_pending or not self._subscribers(topic):
+            return
+        try:
+            self._fanout_queue.put_nowait(topic)
+        except asyncio.QueueFull:
+            self._stats.fanout_dropped += 1
+            log.warning("Fan-out queue full — dropping broadcast for %s", topic)
+            return
+        self._fanout_pending.add(topic)
+        depth = self._fanout_queue.qsize()
+        if depth > self._stats.fanout_queue_max:
+            self._stats.fanout_queue_max = depth
+
+    async def _fanout_loop(self):
+        while True:
+            topic = await self._fanout_queue.get()
+            self._fanout_pending.discard(topic)
+            if topic in self._fanout_inflight:
+                # Another worker is mid-broadcast; it re-queues once done so
+                # sends for one topic never overtake each other.
+                self._fanout_rerun.add(topic)
+                continue
+            self._fanout_inflight.add(topic)
+            try:
+                await self._broadcast_topic(topic)
+                self._stats.broadcasts += 1
+            finally:
+                self._fanout_inflight.discard(topic)
+            if topic in self._fanout_rerun:
+                self._fanout_rerun.discard(topic)
+                self._mark_dirty(topic)
+
+    def stats(self) -> dict:
+        st = self._stats
+        conns = sorted(self._browsers.values(), key=lambda c: c.lag, reverse=True)
+        return {
+            "relay_connected": self.relay_is_connected,
+            "relay_protocol": (self._relay_decoder.stats() if self._relay_decoder
+                               else {"codec": "json"}),
+            "browsers": len(self._browsers),
+            "topics": len(self._subscriptions),
+            "browser_lag": {
+                "max_ms": round(conns[0].lag * 1000, 1) if conns else 0.0,
+                "evicted": st.slow_consumers_evicted,
+                "slowest": [
+                    {
+                        "lag_ms": round(c.lag * 1000, 1),
+                        "pending": c.pending,
+                        "sent": c.sent,
+                        "conflated": c.conflated,
+                    }
+                    for c in conns[:10]
+                ],
+            },
+            "ingest": {
+                "depth": self._ingest_queue.qsize(),
+                "max_depth": st.ingest_queue_max,
+                "limit": self._ingest_queue.maxsize,
+                "processed": st.ingested,
+                "lag_avg_ms": round(st.ingest_lag_total / st.ingested * 1000, 3) if st.ingested else 0.0,
+                "lag_max_ms": round(st.ingest_lag_max * 1000, 3),
+            },
+            "fanout": {
+                "depth": self._fanout_queue.qsize(),
+                "max_depth": st.fanout_queue_max,
+                "limit": self._fanout_queue.maxsize,
+                "workers": self._fanout_workers,
+                "broadcasts": st.broadcasts,
+                "dropped": st.fanout_dropped,
+            },
+            "scheduler": self._scheduler.stats(),
+            "backplane": self._backplane.stats(),
+            "cache": cache.stats(),
+        }
+
+    # ── Requests to the relay ───────────────────────────────────────
 
     async def request_pbp(self, game_id: str):
+        await self._send_control(json.dumps({"type": "request_pbp", "game_id": game_id}))
+
+    async def _send_control(self, msg: str):
+        if self.relay_ws:
+            await self._handle_control_message(msg)
+        else:
+            # The relay may be attached to another worker
+            await self._backplane.publish_control(msg)
+
+    async def _handle_control_message(self, raw: str):
         if self.relay_ws:
             try:
-                await self.relay_ws.send_json({
-                    "type": "request_pbp",
-                    "game_id": game_id,
-                })
+                await self.relay_ws.send_text(raw)
             except Exception:
-                log.warning("Failed to send PBP request to relay")
+                log.warning("Failed to send control message to relay")
 
     # ── Broadcast helpers ───────────────────────────────────────────
 
-    async def _broadcast_scoreboard(self):
-        subs = self._subscriptions.get("scoreboard", set()).copy()
-        if not subs:
+    async def _broadcast_topic(self, topic: str):
+        if topic.startswith("pbp:"):
+            await self._broadcast_pbp(topic[4:])
+            return
+        if not self._subscriptions.get(topic):
             return
 
         try:
-            games = await self._provider.get_scoreboard("all")
-            payload = json.dumps({
-                "type": "scoreboard",
-                "games": [g.to_dict() for g in games],
-            })
+            snap = await self._snapshots.get(topic)
         except Exception:
-            log.exception("Error building scoreboard payload")
+            log.exception("Error building payload for %s", topic)
+            return
+        # Re-read after the await: sockets may have come or gone meanwhile
+        subs = self._subscriptions.get(topic)
+        if snap is None or not subs:
             return
 
-        await self._send_to_many(subs, payload)
-
-    async def _broadcast_game_update(self, game_id: str):
-        topic = f"game:{game_id}"
-        subs = self._subscriptions.get(topic, set()).copy()
-        if not subs:
+        if snap.state is None:
+            self._send_to_many(subs, topic, snap.payload)
             return
 
+        base = self._delta_base.get(topic)
+        if base is None or base.version >= snap.version:
+            self._delta_base[topic] = snap
+            self._send_to_many(subs, topic, snap.payload)
+            return
+        delta = self._encode_scoreboard_delta(topic, base, snap)
+        # Nothing sent means clients are still on the old base — keep diffing from it
+        if delta is not None:
+            self._delta_base[topic] = snap
+            self._send_to_many(subs, topic, delta, snap.payload)
+
+    async def _broadcast_pbp(self, game_id: str):
+        """Send game subscribers only the plays first seen since the last ones we streamed."""
+        after = self._pbp_sent.get(game_id, -1)
         try:
-            detail = await self._provider.get_game(game_id)
-            if not detail:
-                return
-            payload = json.dumps({
-                "type": "game_update",
-                "game_id": game_id,
-                "data": detail.to_dict(),
-            })
+            payload, last_seq = await self._encode_pbp_append(game_id, after)
         except Exception:
-            log.exception("Error building game update payload")
+            log.exception("Error building PBP append for %s", game_id)
             return
-
-        await self._send_to_many(subs, payload)
-
-    async def _send_to_many(self, websockets: set[WebSocket], payload: str):
-        dead = []
-        sends = []
+        if payload is None:
+            return
+        subs = self._subscribers(f"pbp:{game_id}")
+        if subs:
+            # The cursor exists only while the game is watched: subscribe() starts
+            # it at the store's last seq and the last unsubscribe drops it
+            self._pbp_sent[game_id] = last_seq
+            self._send_to_many(subs, f"pbp:{game_id}", payload)
+
+    async def _encode_pbp_append(self, game_id: str, after: int) -> tuple[str | None, int]:
+        """Encode a ``pbp_append`` with the events whose ``seq`` is greater than ``after``.
+
+        Returns (payload or None if there is nothing new, newest seq).
+        """
+        new = await self._provider.get_play_by_play_since(game_id, after)
+        if not new:
+            return None, after
+        last_seq = new[-1].seq
+        return json_message(
+            {"type": "pbp_append", "game_id": game_id, "after": after, "last_seq": last_seq},
+            events=json_array(reversed(new)),  # newest first
+        ), last_seq
+
+    async def send_pbp_catchup(self, ws: WebSocket, game_id: str, since: int):
+        """Cursor-based catch-up: everything after the client's last-seen seq.
+
+        Only answers this socket — the broadcast cursor is never touched here.
+        """
+        # Clamp cursors from the future (e.g. a stale tab across a restart) to what we hold
+        since = min(since, await self._provider.get_pbp_last_seq(game_id))
+        payload, _ = await self._encode_pbp_append(game_id, since)
+        if payload is not None:
+            self.send(ws, f"pbp:{game_id}", payload)
+
+    @staticmethod
+    def _encode_scoreboard_delta(topic: str, base: Snapshot, snap: Snapshot) -> str | None:
+        """Only the games whose fields changed between two scoreboard snapshots."""
+        old, new = base.state, snap.state
+        changed = [g for gid, g in new.items() if old.get(gid) != g]
+        removed = [gid for gid in old if gid not in new]
+        if not changed and not removed:
+            return None
+        return json_message(
+            {
+                "type": "scoreboard_delta",
+                "topic": topic,
+                "version": snap.version,
+                "base_version": base.version,
+                "removed": removed,
+            },
+            games="[" + ",".join(changed) + "]",
+        )
+
+    def _send_to_many(self, websockets: set[WebSocket], topic: str, payload: str,
+                      full: str | None = None):
+        # Must stay await-free: it iterates the live subscription set
         for ws in websockets:
-            sends.append(self._safe_send(ws, payload, dead))
-        await asyncio.gather(*sends)
-
-        if dead:
-            async with self._lock:
-                for ws in dead:
-                    self._browsers.discard(ws)
-                    for topic_subs in self._subscriptions.values():
-                        topic_subs.discard(ws)
+            self.send(ws, topic, payload, full)
+
+    # ── Payload building ────────────────────────────────────────────
+
+    async def _build_payload(self, topic: str, version: int) -> Snapshot | None:
+        """Build + encode the full-state message for ``topic`` (cache miss path).
+
+        Topics: ``scoreboard`` (every sport), ``scoreboard:<sport>``, ``game:<id>``.
+        """
+        if topic == "scoreboard" or topic.startswith("scoreboard:"):
+            sport = topic.split(":", 1)[1] if ":" in topic else "all"  # inverse of scoreboard_topic
+            games = await self._provider.get_scoreboard(sport)
+            encoded = {g.game_id: g.to_json() for g in games}
+            payload = json_message(
+                {"type": "scoreboard", "topic": topic, "version": version},
+                games="[" + ",".join(encoded.values()) + "]",
+            )
+            return Snapshot(version, payload, encoded)
+
+        if topic.startswith("game:"):
+            game_id = topic.split(":", 1)[1]
+            detail = await self._provider.get_game(game_id)
+            if not detail:
+                return None
+            return Snapshot(version, json_message(
+                {"type": "game_update", "game_id": game_id, "version": version},
+                data=detail.to_json(include_pbp=False),
+            ))
 
-    async def _safe_send(self, ws: WebSocket, payload: str, dead: list):
-        try:
-            await ws.send_text(payload)
-        except Exception:
-            dead.append(ws)
+        return None
 
     # ── Initial state for new subscribers ───────────────────────────
 
-    async def get_scoreboard_payload(self) -> str:
-        games = await self._provider.get_scoreboard("all")
-        return json.dumps({
-            "type": "scoreboard",
-            "games": [g.to_dict() for g in games],
-        })
+    async def get_payload(self, topic: str) -> str | None:
+        snap = await self._snapshots.get(topic)
+        return snap.payload if snap else None
+
+    def data_version(self, *topics: str) -> str | None:
+        """Combined version of the state behind ``topics`` (for HTTP ETags).
 
-    async def get_game_payload(self, game_id: str) -> str | None:
-        detail = await self._provider.get_game(game_id)
-        if not detail:
+        None until the first relay write, i.e. whenever the data isn't relay-driven.
+        Prefixed with the backplane epoch, so a restarted sequence can't repeat a version.
+        """
+        versions = [self._snapshots.peek_version(t) for t in topics]
+        if None in versions:
             return None
-        return json.dumps({
-            "type": "game_update",
-            "game_id": game_id,
-            "data": detail.to_dict(),
-        })
+        return f"{self._backplane.epoch}:" + ".".join(map(str, versions))
 
 
 # Module-level singleton
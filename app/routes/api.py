@@ -1,28 +1,157 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
 
-from ..data.provider import DataProvider
+from .. import config
+from ..data.encoding import json_array, json_message
+from ..data.provider import GAME_SECTIONS, DataProvider, UnknownCursor
+from ..http_cache import cache_control, make_etag, not_modified, with_validators
+from ..page_cache import page_cache
+from ..realtime import manager, scoreboard_topic
 
 router = APIRouter()
 provider: DataProvider = None  # injected by main.py
 
 
+def _json(body: str) -> Response:
+    # Models encode themselves (see data/encoding.py); skip jsonable_encoder
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/scoreboard")
-async def scoreboard(sport: str = "all"):
+async def scoreboard(request: Request, sport: str = "all"):
+    etag = make_etag(f"api:scoreboard:{sport}", manager.data_version(scoreboard_topic(sport)))
+    cc = cache_control(final=False)
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
     games = await provider.get_scoreboard(sport)
-    return {"games": [g.to_dict() for g in games]}
+    return with_validators(_json('{"games":' + json_array(games) + "}"), etag, cc)
 
 
 @router.get("/game/{game_id}")
-async def game_detail(game_id: str):
+async def game_detail(request: Request, game_id: str):
+    etag = make_etag(f"api:game:{game_id}", manager.data_version(f"game:{game_id}", f"pbp:{game_id}"))
+    status = await provider.get_game_status(game_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    cc = cache_control(final=status == "final")
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
     detail = await provider.get_game(game_id)
     if not detail:
         raise HTTPException(status_code=404, detail="Game not found")
-    return detail.to_dict()
+    return with_validators(_json(detail.to_json()), etag, cc)
 
 
 @router.get("/game/{game_id}/pbp")
-async def game_pbp(game_id: str):
-    events = await provider.get_play_by_play(game_id)
-    if events is None:
+async def game_pbp(
+    request: Request,
+    game_id: str,
+    since_event_id: str | None = None,
+    before_event_id: str | None = None,
+    limit: int | None = Query(None, ge=1, le=1000),
+):
+    """Whole game newest first, or a window of it.
+
+    ``since_event_id`` catches up from the last event a client has,
+    ``before_event_id`` pages back, and ``limit`` keeps the newest N of the
+    window. Paged responses carry ``has_more`` and ``last_seq``.
+    """
+    etag = make_etag(f"api:pbp:{game_id}?{request.url.query}", manager.data_version(f"pbp:{game_id}"))
+    status = await provider.get_game_status(game_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    return {"events": [e.to_dict() for e in events]}
+    cc = cache_control(final=status == "final")
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
+
+    if since_event_id is None and before_event_id is None and limit is None:
+        events = await provider.get_play_by_play(game_id)
+        if events is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+        return with_validators(_json('{"events":' + json_array(events) + "}"), etag, cc)
+
+    try:
+        page = await provider.get_play_by_play_page(game_id, since_event_id, before_event_id, limit)
+    except UnknownCursor as e:
+        # Dropped or never seen — the client should refetch without the cursor
+        raise HTTPException(status_code=410, detail=f"Unknown event id: {e.args[0]}")
+    body = json_message({"has_more": page.has_more, "last_seq": page.last_seq}, events=json_array(page.events))
+    return with_validators(_json(body), etag, cc)
+
+
+# ``fields`` names accepted by /api/games -> GameDetail sections
+_FIELDS = {
+    "summary": ("summary",),
+    "players": ("home_players", "away_players"),
+    "home_players": ("home_players",),
+    "away_players": ("away_players",),
+    "pbp": ("play_by_play",),
+    "play_by_play": ("play_by_play",),
+    "team_stats": ("home_team_stats", "away_team_stats"),
+    "home_team_stats": ("home_team_stats",),
+    "away_team_stats": ("away_team_stats",),
+}
+
+
+class GamesQuery(BaseModel):
+    ids: list[str]
+    fields: list[str] | None = None
+
+
+def _sections(fields: list[str] | None) -> tuple[str, ...]:
+    if not fields:
+        return GAME_SECTIONS
+    wanted = set()
+    for name in fields:
+        if name not in _FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        wanted.update(_FIELDS[name])
+    return tuple(name for name in GAME_SECTIONS if name in wanted)
+
+
+async def _games(request: Request, ids: list[str], fields: list[str] | None):
+    ids = list(dict.fromkeys(i for i in ids if i))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No game ids")
+    if len(ids) > config.API_BATCH_MAX_GAMES:
+        raise HTTPException(status_code=400, detail=f"At most {config.API_BATCH_MAX_GAMES} games per request")
+    sections = _sections(fields)
+    with_pbp = "play_by_play" in sections
+
+    topics = [f"game:{i}" for i in ids] + ([f"pbp:{i}" for i in ids] if with_pbp else [])
+    etag = make_etag(f"api:games:{','.join(ids)}:{','.join(sections)}", manager.data_version(*topics))
+    details = await provider.get_games(ids, include_pbp=with_pbp)
+    found = {i: d for i, d in details.items() if d is not None}
+    cc = cache_control(final=bool(found) and len(found) == len(ids)
+                       and all(d.summary.status == "final" for d in found.values()))
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
+
+    encoded = [json_message({"game_id": i}, data=d.select_json(sections)) for i, d in found.items()]
+    body = json_message({"missing": [i for i in ids if i not in found]}, games="[" + ",".join(encoded) + "]")
+    return with_validators(_json(body), etag, cc)
+
+
+@router.get("/games")
+async def games(request: Request, ids: str, fields: str | None = None):
+    """Several games in one response: ``?ids=a,b,c&fields=summary,team_stats``.
+
+    ``fields`` picks sections (summary, players, pbp, team_stats, or the
+    individual home_/away_ names); the default is the full game.
+    """
+    return await _games(request, ids.split(","), fields.split(",") if fields else None)
+
+
+@router.post("/games")
+async def games_post(request: Request, query: GamesQuery):
+    """Same as GET /api/games, for id lists too long for a query string."""
+    return await _games(request, query.ids, query.fields)
+
+
+@router.get("/realtime/stats")
+async def realtime_stats():
+    stats = {**manager.stats(), "page_cache": page_cache.stats()}
+    if (reader := getattr(provider, "reader", None)) is not None:
+        stats["replica"] = reader.stats()
+    return stats
@@ -1,36 +1,73 @@
 from fastapi import APIRouter, Request
 from fastapi.templating import Jinja2Templates
 
+from .. import config
 from ..data.provider import DataProvider
+from ..http_cache import cache_control, make_etag, not_modified, with_validators
+from ..page_cache import RenderedPage, page_cache
+from ..realtime import manager, scoreboard_topic
 
 router = APIRouter()
 templates: Jinja2Templates = None  # injected by main.py
 provider: DataProvider = None  # injected by main.py
 
 
+def _cacheable(key: tuple) -> bool:
+    # key[-1] is the data version; None means the data isn't versioned (mock/DSG)
+    return config.PAGE_CACHE_ENABLED and key[-1] is not None
+
+
+def _cached_page(key: tuple) -> RenderedPage | None:
+    return page_cache.get(key) if _cacheable(key) else None
+
+
+def _render(request: Request, name: str, context: dict, key: tuple, etag: str | None, cc: str):
+    response = templates.TemplateResponse(name, {"request": request, **context})
+    if _cacheable(key):
+        response = page_cache.put(key, response.body).response(request)
+    return with_validators(response, etag, cc)
+
+
 @router.get("/")
 async def home(request: Request, sport: str = "all"):
+    version = manager.data_version(scoreboard_topic(sport))
+    etag = make_etag(f"page:home:{sport}", version)
+    cc = cache_control(final=False)
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
+    key = ("home.html", sport, version)
+    if (page := _cached_page(key)) is not None:
+        return with_validators(page.response(request), etag, cc)
     games = await provider.get_scoreboard(sport)
+    return _render(request, "home.html", {"games": games, "current_sport": sport}, key, etag, cc)
+
+
+def _no_game(request: Request):
     return templates.TemplateResponse("home.html", {
         "request": request,
-        "games": games,
-        "current_sport": sport,
+        "games": [],
+        "current_sport": "all",
     })
 
 
 @router.get("/game/{game_id}")
 async def game(request: Request, game_id: str):
+    # Version first: data read after it is at least that new, never older
+    version = manager.data_version(f"game:{game_id}", f"pbp:{game_id}")
+    status = await provider.get_game_status(game_id)
+    if status is None:
+        return _no_game(request)
+    etag = make_etag(f"page:game:{game_id}", version)
+    cc = cache_control(final=status == "final")
+    if (cached := not_modified(request, etag, cc)) is not None:
+        return cached
+    key = ("game.html", game_id, version)
+    if (page := _cached_page(key)) is not None:
+        return with_validators(page.response(request), etag, cc)
     detail = await provider.get_game(game_id)
     if not detail:
-        return templates.TemplateResponse("home.html", {
-            "request": request,
-            "games": [],
-            "current_sport": "all",
-        })
-    return templates.TemplateResponse("game.html", {
-        "request": request,
-        "game": detail,
-    })
+        return _no_game(request)
+    return _render(request, "game.html", {"game": detail}, key, etag, cc)
 
 
 @router.get("/about")
@@ -5,6 +5,8 @@ import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 
+from relay.codec import BatchDecoder, FrameError, choose_subprotocol, codec_for
+
 from .. import config
 from ..realtime import manager
 
@@ -28,15 +30,31 @@ async def ws_relay(ws: WebSocket, secret: str = Query("")):
         )
         return
 
-    await ws.accept()
-    await manager.connect_relay(ws)
+    # Batched binary frames if the relay offers a codec we have, else one JSON text frame per message
+    subprotocol = choose_subprotocol(ws.scope.get("subprotocols", []))
+    decoder = BatchDecoder(codec_for(subprotocol)) if subprotocol else None
+    await ws.accept(subprotocol=subprotocol)
+    await manager.connect_relay(ws, decoder)
 
     try:
         while True:
-            raw = await ws.receive_text()
-            await manager.handle_relay_message(raw)
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                if decoder is None:
+                    log.warning("Binary relay frame without a negotiated codec — ignored")
+                    continue
+                for raw in decoder.decode(message["bytes"]):
+                    await manager.handle_relay_message(raw)
+            elif message.get("text") is not None:
+                await manager.handle_relay_message(message["text"])
     except WebSocketDisconnect:
         pass
+    except FrameError as e:
+        # The compression stream is broken; the relay reconnects and starts a fresh one
+        log.warning("Bad relay frame (%s) — closing relay connection", e)
+        await ws.close(code=1007, reason="bad frame")
     except Exception:
         log.exception("Relay WebSocket error")
     finally:
@@ -61,26 +79,39 @@ async def ws_live(ws: WebSocket):
 
             if msg_type == "subscribe":
                 topic = msg.get("topic", "")
-                if not topic:
+                if not topic or not manager.known_topic(topic):
                     continue
 
                 await manager.subscribe(ws, topic)
 
                 # Send current state immediately
                 try:
-                    if topic == "scoreboard":
-                        payload = await manager.get_scoreboard_payload()
-                        await ws.send_text(payload)
-                    elif topic.startswith("game:"):
-                        game_id = topic.split(":", 1)[1]
-                        payload = await manager.get_game_payload(game_id)
-                        if payload:
-                            await ws.send_text(payload)
+                    payload = await manager.get_payload(topic)
+                    if payload:
+                        manager.send(ws, topic, payload)
+                    if topic.startswith("game:"):
                         # Request PBP from relay so it starts streaming it
-                        await manager.request_pbp(game_id)
+                        await manager.request_pbp(topic.split(":", 1)[1])
                 except Exception:
                     pass
 
+            elif msg_type == "resync":
+                # Client saw a version gap in its deltas — resend full state
+                topic = msg.get("topic", "")
+                if topic and manager.known_topic(topic):
+                    payload = await manager.get_payload(topic)
+                    if payload:
+                        manager.send(ws, topic, payload)
+
+            elif msg_type == "pbp_catchup":
+                game_id = msg.get("game_id", "")
+                try:
+                    since = int(msg.get("since", -1))
+                except (TypeError, ValueError):
+                    since = -1
+                if game_id:
+                    await manager.send_pbp_catchup(ws, game_id, since)
+
             elif msg_type == "unsubscribe":
                 topic = msg.get("topic", "")
                 if topic:
@@ -8,7 +8,8 @@
     let prevHome = null;
     let prevAway = null;
     let prevPeriod = null;
-    let lastEventId = -1;
+    let lastSeq = -1; // PBP cursor: highest event seq we have
+    let allEvents = []; // newest first, for the pulse timeline
     let runTracker = { team: null, points: 0 };
     let momentumEvents = []; // { team, points, time }
     let ws = null;
@@ -261,13 +262,22 @@
 
         // Dynamic background
         updateAtmosphere(s.home_score, s.away_score, s.status);
+    }
 
-        // Update PBP feed (incremental)
-        const pbpFeed = document.getElementById("pbp-feed");
-        if (pbpFeed && data.play_by_play && data.play_by_play.length > 0) {
-            const newEvents = data.play_by_play.filter(e => e.event_id > lastEventId);
+    // ── Play-by-play stream ──────────────────────────────────────
 
-            if (newEvents.length > 0 && lastEventId >= 0) {
+    function handlePbpAppend(msg) {
+        if (msg.after > lastSeq) {
+            // We missed plays in between — fetch from our cursor instead
+            requestCatchup();
+            return;
+        }
+        const newEvents = msg.events.filter(e => e.seq > lastSeq);
+        if (newEvents.length === 0) return;
+
+        const pbpFeed = document.getElementById("pbp-feed");
+        if (pbpFeed) {
+            if (lastSeq >= 0) {
                 const fragment = document.createDocumentFragment();
                 newEvents.forEach(e => {
                     const scoring = isScoringPlay(e.description) ? "scoring-play" : "";
@@ -283,9 +293,9 @@
                     pbpSoundEffect(e.description);
                 });
                 pbpFeed.insertBefore(fragment, pbpFeed.firstChild);
-            } else if (lastEventId < 0) {
+            } else {
                 let html = "";
-                data.play_by_play.forEach(e => {
+                newEvents.forEach(e => {
                     const scoring = isScoringPlay(e.description) ? "scoring-play" : "";
                     const playType = classifyPlay(e.description);
                     html += `
@@ -298,11 +308,17 @@
                 });
                 pbpFeed.innerHTML = html;
             }
+        }
 
-            const maxId = Math.max(...data.play_by_play.map(e => e.event_id));
-            if (maxId > lastEventId) lastEventId = maxId;
+        // Events arrive newest first
+        allEvents = newEvents.concat(allEvents);
+        lastSeq = Math.max(lastSeq, ...newEvents.map(e => e.seq));
+        buildPulseTimeline(allEvents);
+    }
 
-            buildPulseTimeline(data.play_by_play);
+    function requestCatchup() {
+        if (ws && ws.readyState === WebSocket.OPEN) {
+            ws.send(JSON.stringify({ type: "pbp_catchup", game_id: gameId, since: lastSeq }));
         }
     }
 
@@ -314,6 +330,8 @@
 
         ws.onopen = function () {
             ws.send(JSON.stringify({ type: "subscribe", topic: `game:${gameId}` }));
+            // Plays stream as appends; fetch whatever we missed since our cursor
+            requestCatchup();
         };
 
         ws.onmessage = function (evt) {
@@ -321,6 +339,8 @@
                 const msg = JSON.parse(evt.data);
                 if (msg.type === "game_update" && msg.game_id === gameId && msg.data) {
                     handleGameData(msg.data);
+                } else if (msg.type === "pbp_append" && msg.game_id === gameId) {
+                    handlePbpAppend(msg);
                 }
             } catch (e) {
                 // ignore parse errors
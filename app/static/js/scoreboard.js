@@ -1,10 +1,14 @@
 (function () {
     const RECONNECT_DELAY = 3000;
     const sport = new URLSearchParams(window.location.search).get("sport") || "all";
+    // Per-sport topic so we only receive the slate this page renders
+    const topic = sport === "all" ? "scoreboard" : `scoreboard:${sport}`;
 
     // Track previous scores for flash detection
     const prevScores = {};
     let ws = null;
+    // Version of the scoreboard state we hold; deltas must build on it
+    let version = null;
 
     function updateScoreboard(games) {
         games.forEach(g => {
@@ -55,13 +59,23 @@
         ws = new WebSocket(`${proto}//${location.host}/ws/live`);
 
         ws.onopen = function () {
-            ws.send(JSON.stringify({ type: "subscribe", topic: "scoreboard" }));
+            ws.send(JSON.stringify({ type: "subscribe", topic: topic }));
         };
 
         ws.onmessage = function (evt) {
             try {
                 const msg = JSON.parse(evt.data);
                 if (msg.type === "scoreboard" && msg.games) {
+                    version = msg.version;
+                    updateScoreboard(msg.games);
+                } else if (msg.type === "scoreboard_delta") {
+                    if (version !== null && msg.version <= version) return; // already have it
+                    if (msg.base_version !== version) {
+                        // Missed an update — ask for the full slate
+                        ws.send(JSON.stringify({ type: "resync", topic: topic }));
+                        return;
+                    }
+                    version = msg.version;
                     updateScoreboard(msg.games);
                 }
             } catch (e) {
@@ -71,6 +85,7 @@
 
         ws.onclose = function () {
             ws = null;
+            version = null;
             setTimeout(connectWS, RECONNECT_DELAY);
         };
 
@@ -0,0 +1,148 @@
+"""Fingerprinted, pre-compressed static assets.
+
+At startup ``build_static`` copies every file under ``app/static`` into a
+build directory twice: under its own name and under a content-hashed name
+(``js/game.3f9c1a2b7d.js``). For text assets it also writes ``.gz`` and,
+when the optional ``brotli`` package is installed, ``.br`` siblings. Output is
+content-addressed and written atomically, so several workers can build
+into the same directory at once.
+
+``PrecompressedStaticFiles`` serves that directory. It picks a compressed
+sibling from ``Accept-Encoding`` and marks hashed names immutable.
+Templates reference assets through ``static_url("js/game.js")``, which
+resolves to the hashed URL.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from . import config
+from .http_cache import preferred_encoding
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+log = logging.getLogger("static")
+
+_COMPRESSIBLE = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+_MIN_COMPRESS_SIZE = 256  # bytes; smaller files aren't worth a round of decompression
+
+
+class StaticManifest:
+    def __init__(self, prefix: str = "/static"):
+        self.prefix = prefix.rstrip("/")
+        # logical path ("js/game.js") -> hashed path ("js/game.3f9c1a2b7d.js")
+        self.hashed: dict[str, str] = {}
+        self.hashed_names: set[str] = set()
+        # served path -> encodings with a sibling on disk, in preference order
+        self.encodings: dict[str, list[str]] = {}
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever any asset does — pages embedding asset URLs depend on it."""
+        joined = ",".join(sorted(self.hashed_names))
+        return hashlib.blake2b(joined.encode(), digest_size=5).hexdigest()
+
+    def url(self, path: str) -> str:
+        path = path.lstrip("/")
+        return f"{self.prefix}/{self.hashed.get(path, path)}"
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_variants(out_dir: Path, rel: str, data: bytes, compress: bool, manifest: StaticManifest,
+                    overwrite: bool):
+    target = out_dir / rel
+    if overwrite or not target.exists():
+        _write_atomic(target, data)
+    if not compress:
+        return
+    codings = []
+    for coding, suffix in _SUFFIXES.items():
+        if coding == "br" and brotli is None:
+            continue
+        sibling = target.with_name(target.name + suffix)
+        if overwrite or not sibling.exists():
+            if coding == "br":
+                _write_atomic(sibling, brotli.compress(data, quality=11))
+            else:
+                _write_atomic(sibling, gzip.compress(data, compresslevel=9, mtime=0))
+        codings.append(coding)
+    manifest.encodings[rel] = codings
+
+
+def build_static(src_dir: Path, out_dir: Path, prefix: str = "/static") -> StaticManifest:
+    """Fingerprint + pre-compress everything under ``src_dir`` into ``out_dir``."""
+    manifest = StaticManifest(prefix)
+    for src in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+        rel = src.relative_to(src_dir).as_posix()
+        data = src.read_bytes()
+        digest = hashlib.blake2b(data, digest_size=5).hexdigest()
+        stem, dot, ext = rel.rpartition(".")
+        hashed = f"{stem}.{digest}.{ext}" if dot and "/" not in ext else f"{rel}.{digest}"
+        compress = src.suffix in _COMPRESSIBLE and len(data) >= _MIN_COMPRESS_SIZE
+        # The plain name is rewritten every start; hashed names never change content
+        _write_variants(out_dir, rel, data, compress, manifest, overwrite=True)
+        _write_variants(out_dir, hashed, data, compress, manifest, overwrite=False)
+        manifest.hashed[rel] = hashed
+        manifest.hashed_names.add(hashed)
+    log.info("Built %d static assets into %s (encodings: %s)", len(manifest.hashed), out_dir,
+             "br,gzip" if brotli else "gzip")
+    return manifest
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves ``.br``/``.gz`` siblings and caches hashed names forever."""
+
+    def __init__(self, *, manifest: StaticManifest, **kwargs):
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        rel = path.replace(os.sep, "/")
+        available = self.manifest.encodings.get(rel)
+        response = None
+        if available and scope["method"] in ("GET", "HEAD"):
+            coding = preferred_encoding(Headers(scope=scope).get("accept-encoding"), available)
+            if coding:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + _SUFFIXES[coding])
+                if stat_result is not None:
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["Content-Encoding"] = coding
+                    response.headers["Content-Type"] = _media_type(rel)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if available:
+            response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={config.STATIC_MAX_AGE}, immutable"
+                if rel in self.manifest.hashed_names else "no-cache"
+            )
+        return response
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type in ("application/javascript", "text/javascript"):
+        media_type += "; charset=utf-8"
+    return media_type
@@ -0,0 +1,87 @@
+"""Micro-benchmark: encoding a full box score (players + PBP) to JSON.
+
+Compares the old path — ``dataclasses.asdict`` then FastAPI's
+``jsonable_encoder`` + ``json.dumps`` — with the generated ``to_json``
+encoders, both cold (fresh models) and warm (cached on the instance, which
+is what memoized provider models get).
+
+    python -m bench.bench_encoding [--events 400] [--number 200]
+"""
+
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+
+from fastapi.encoders import jsonable_encoder
+
+from app.data.provider import GameDetail, GameSummary, PlayerStats, PlayEvent
+
+
+def build_detail(n_events: int, n_players: int = 13) -> GameDetail:
+    summary = GameSummary(
+        game_id="bench-game", sport="nba", status="live", home_team="Home", away_team="Away",
+        home_score=101, away_score=99, period=4, clock="2:31", start_time="2026-02-24T00:00:00Z",
+    )
+
+    def players(side: str):
+        return tuple(
+            PlayerStats(
+                name=f"{side} Player {i}", position="G", minutes="24:10", points=i, rebounds=3,
+                assists=2, steals=1, blocks=0, fg="4-9", three_pt="1-3", ft="2-2", plus_minus=i - 6,
+            )
+            for i in range(n_players)
+        )
+
+    pbp = tuple(
+        PlayEvent(
+            event_id=f"ev-{i}", seq=i, clock=f"{11 - i % 12}:00", period=1 + i // 100,
+            team="HOM" if i % 2 else "AWY", player=f"Player {i % 10}",
+            description=f"Player {i % 10} makes two point layup", home_score=i, away_score=i // 2,
+        )
+        for i in range(n_events - 1, -1, -1)
+    )
+    stats = {"fg_pct": 47.3, "three_pct": 35.0, "ft_pct": 81.8, "rebounds": 41, "assists": 22}
+    return GameDetail(summary, players("Home"), players("Away"), pbp, dict(stats), dict(stats))
+
+
+def _old_to_dict(detail: GameDetail) -> dict:
+    def plain(obj):
+        d = asdict(obj)
+        d.pop("_json", None)
+        return d
+
+    return {
+        "summary": plain(detail.summary),
+        "home_players": [plain(p) for p in detail.home_players],
+        "away_players": [plain(p) for p in detail.away_players],
+        "play_by_play": [plain(e) for e in detail.play_by_play],
+        "home_team_stats": dict(detail.home_team_stats),
+        "away_team_stats": dict(detail.away_team_stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    detail = build_detail(args.events)
+    assert json.loads(detail.to_json()) == _old_to_dict(detail)
+
+    cases = {
+        "asdict + jsonable_encoder + json.dumps": lambda: json.dumps(jsonable_encoder(_old_to_dict(detail))).encode(),
+        "asdict + json.dumps": lambda: json.dumps(_old_to_dict(detail)).encode(),
+        "to_json (cold)": lambda: build_detail(args.events).to_json().encode(),
+        "  of which building the models": lambda: build_detail(args.events),
+        "to_json (warm)": lambda: detail.to_json().encode(),
+    }
+    print(f"box score: 26 players, {args.events} PBP events, {len(detail.to_json())} bytes")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{name:<42} {best * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Benchmark: relay uplink bytes and encode/decode time per tick, full NCAAMB slate.
+
+Replays a synthetic Saturday slate: the first tick sends the full schedule
+plus every live game's summary (what the relay sends on connect), and each
+later tick changes the score in every live game, so it sends a
+``schedule_patch``, all live summaries and one game's PBP (``--pbp``
+events). That is the worst case for one tick. Compared:
+
+- JSON text: one text frame per message, no compression;
+- JSON + permessage-deflate: the same frames deflated per message with
+  context takeover (the ``websockets`` default before binary frames);
+- batched zlib / zstd: one ``relay.codec`` frame per tick (zstd only if the
+  ``zstandard`` package is installed).
+
+    python -m bench.bench_relay_codec [--games 150] [--live 0.6] [--ticks 20] [--pbp 400]
+"""
+
+import argparse
+import json
+import random
+import time
+import zlib
+
+from relay.codec import BatchDecoder, BatchEncoder, available_codecs
+
+
+def _team(r: random.Random, name: str, points: int) -> dict:
+    players = []
+    for j in range(13):
+        made, att = r.randint(0, 9), r.randint(9, 16)
+        players.append({
+            "id": f"{name.lower()}-p{j}-{r.getrandbits(32):08x}",
+            "full_name": f"{r.choice('ABCDEFGHJKLMNPRSTW')}. {name} Player{j}",
+            "jersey_number": str(r.randint(0, 55)),
+            "position": r.choice(["G", "F", "C"]),
+            "statistics": {
+                "minutes": f"{r.randint(0, 32)}:{r.randint(0, 59):02d}",
+                "points": r.randint(0, 24), "rebounds": r.randint(0, 11), "assists": r.randint(0, 8),
+                "steals": r.randint(0, 3), "blocks": r.randint(0, 3), "turnovers": r.randint(0, 4),
+                "field_goals_made": made, "field_goals_att": att,
+                "field_goals_pct": round(100 * made / att, 1),
+                "three_points_made": r.randint(0, 4), "three_points_att": r.randint(4, 8),
+                "free_throws_made": r.randint(0, 6), "free_throws_att": r.randint(6, 8),
+                "offensive_rebounds": r.randint(0, 4), "defensive_rebounds": r.randint(0, 7),
+                "personal_fouls": r.randint(0, 4), "plus_minus": r.randint(-15, 15),
+            },
+        })
+    return {
+        "id": f"team-{name.lower()}", "name": name, "market": f"{name} State", "alias": name[:4].upper(),
+        "points": points,
+        "statistics": {k: sum(p["statistics"][k] for p in players)
+                       for k in ("points", "rebounds", "assists", "field_goals_made", "field_goals_att")},
+        "players": players,
+    }
+
+
+def build_slate(n_games: int, live_frac: float, seed: int = 7):
+    r = random.Random(seed)
+    games, summaries = [], {}
+    for i in range(n_games):
+        gid = f"{r.getrandbits(64):016x}-ncaamb-{i}"
+        status = "inprogress" if r.random() < live_frac else r.choice(["scheduled", "closed"])
+        home, away = f"Home{i}", f"Away{i}"
+        hp, ap = (r.randint(20, 70), r.randint(20, 70)) if status != "scheduled" else (0, 0)
+        games.append({
+            "id": gid, "status": status, "scheduled": f"2026-03-07T{12 + i % 10}:00:00Z",
+            "venue": {"name": f"{home} Arena", "city": "City", "state": "ST"},
+            "home": {"id": f"team-{home.lower()}", "name": home, "alias": home[:4].upper()},
+            "away": {"id": f"team-{away.lower()}", "name": away, "alias": away[:4].upper()},
+            "home_points": hp, "away_points": ap,
+        })
+        if status == "inprogress":
+            summaries[gid] = {
+                "id": gid, "status": status, "clock": "12:34", "half": 2,
+                "home": _team(r, home, hp), "away": _team(r, away, ap),
+            }
+    return {"date": "2026-03-07", "league": {"alias": "NCAAMB"}, "games": games}, summaries
+
+
+def build_pbp(gid: str, n_events: int) -> dict:
+    return {"id": gid, "periods": [{"number": p + 1, "events": [
+        {"id": f"ev-{p}-{k}", "clock": f"{19 - k % 20}:{k % 60:02d}", "event_type": "twopointmade",
+         "description": f"Player{k % 13} makes two point layup", "home_points": k, "away_points": k // 2,
+         "attribution": {"name": "Home", "market": "Home State"},
+         "statistics": [{"player": {"full_name": f"Player{k % 13}"}}]}
+        for k in range(n_events // 2)]} for p in range(2)]}
+
+
+def build_ticks(n_games: int, live_frac: float, n_ticks: int, pbp_events: int) -> list[list[str]]:
+    r = random.Random(11)
+    schedule, summaries = build_slate(n_games, live_frac)
+    first = [json.dumps({"type": "schedule", "sport": "ncaamb", "rev": 1, "data": schedule})]
+    first += [json.dumps({"type": "summary", "game_id": gid, "data": s}) for gid, s in summaries.items()]
+    ticks = [first]
+    for t in range(1, n_ticks):
+        changed = []
+        for game in schedule["games"]:
+            s = summaries.get(game["id"])
+            if s is None:
+                continue
+            side = r.choice(["home", "away"])
+            pts = r.choice([1, 2, 3])
+            game[f"{side}_points"] += pts
+            s[side]["points"] += pts
+            player = r.choice(s[side]["players"])["statistics"]
+            player["points"] += pts
+            player["field_goals_made"] += 1
+            player["field_goals_att"] += 1
+            s["clock"] = f"{r.randint(0, 19)}:{r.randint(0, 59):02d}"
+            changed.append(game)
+        msgs = [json.dumps({"type": "schedule_patch", "sport": "ncaamb", "base_rev": t, "rev": t + 1,
+                            "games": changed, "removed": []})]
+        msgs += [json.dumps({"type": "summary", "game_id": gid, "data": s}) for gid, s in summaries.items()]
+        if pbp_events:
+            gid = next(iter(summaries))
+            msgs.append(json.dumps({"type": "pbp", "game_id": gid, "data": build_pbp(gid, pbp_events)}))
+        ticks.append(msgs)
+    return ticks
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def run_text(ticks):
+    frames = [[m.encode() for m in msgs] for msgs in ticks]
+    return [sum(len(f) for f in tick) for tick in frames], 0.0, 0.0
+
+
+def run_deflate(ticks):
+    c = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    d = zlib.decompressobj(-zlib.MAX_WBITS)
+    enc_t, frames = _timed(lambda: [[c.compress(m.encode()) + c.flush(zlib.Z_SYNC_FLUSH) for m in msgs]
+                                    for msgs in ticks])
+    dec_t, _ = _timed(lambda: [[d.decompress(f).decode() for f in tick] for tick in frames])
+    return [sum(len(f) for f in tick) for tick in frames], enc_t, dec_t
+
+
+def run_batch(codec: str):
+    def run(ticks):
+        encoder, decoder = BatchEncoder(codec), BatchDecoder(codec)
+        enc_t, frames = _timed(lambda: [encoder.encode(msgs) for msgs in ticks])
+        dec_t, decoded = _timed(lambda: [decoder.decode(f) for f in frames])
+        assert decoded == ticks
+        return [len(f) for f in frames], enc_t, dec_t
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=150)
+    parser.add_argument("--live", type=float, default=0.6)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--pbp", type=int, default=400, help="events in one PBP sent each tick (0: none)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ticks = build_ticks(args.games, args.live, args.ticks, args.pbp)
+    n_live = len(ticks[0]) - 1
+    print(f"NCAAMB slate: {args.games} games, {n_live} live, {args.ticks} ticks, "
+          f"{len(ticks[1])} messages per update tick")
+
+    cases = {"JSON text": run_text, "JSON + permessage-deflate": run_deflate}
+    for codec in available_codecs():
+        cases[f"batched {codec}"] = run_batch(codec)
+
+    print(f"{'':<28}{'first tick':>12}{'update tick':>13}{'encode/tick':>13}{'decode/tick':>13}")
+    for name, fn in cases.items():
+        runs = [fn(ticks) for _ in range(args.repeat)]
+        sizes = runs[0][0]
+        enc = min(r[1] for r in runs) / len(ticks)
+        dec = min(r[2] for r in runs) / len(ticks)
+        update = sum(sizes[1:]) / max(1, len(sizes) - 1)
+        print(f"{name:<28}{sizes[0] / 1024:>9.1f} KB{update / 1024:>10.1f} KB"
+              f"{enc * 1e3:>10.2f} ms{dec * 1e3:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
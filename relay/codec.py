@@ -0,0 +1,287 @@
+"""Relay wire protocol: batched, compressed binary frames.
+
+Shared by the relay script and the server's ``/ws/relay`` endpoint. Only
+the standard library is needed; zstd is used when the ``zstandard``
+package is installed on both ends.
+
+Negotiated with a WebSocket subprotocol when the relay connects. The relay
+offers ``lsl-relay.<codec>`` for every codec it has, best first, and the
+server accepts the first one it also has. With no subprotocol agreed, both
+sides fall back to one JSON text frame per message.
+
+A binary frame carries every message from one relay tick:
+
+    frame  = u8 version, record*
+    record = u8 flags, u16 key length, key, u32 payload length, payload
+
+The key names the state a message replaces (``summary:<game_id>``, taken
+from the message's ``type`` and ``sport``/``game_id``). Each payload is
+one JSON message, compressed on its own. With ``FLAG_REF`` set, it was
+compressed using the previous message for the same key as a dictionary.
+For a key's first message, ``FLAG_TYPE_REF`` uses the previous message of
+the same type instead (another game's summary). Messages stay JSON text
+because the server hands each one to the backplane unchanged.
+
+Consecutive summaries of a game differ by a few numbers, so after the first
+tick a summary costs a few hundred bytes on the wire instead of over a
+kilobyte. Both ends keep the same bounded LRU of previous messages, so a
+decoder must see every frame of its connection, in order. Any decode error
+ends the connection, and the relay reconnects with empty references.
+"""
+
+import re
+import struct
+import zlib
+from collections import OrderedDict
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+SUBPROTOCOL_PREFIX = "lsl-relay."
+VERSION = 1
+FLAG_REF = 0x01
+FLAG_TYPE_REF = 0x02
+MAX_REFS = 512                       # previous messages kept per connection, on both ends
+MAX_FRAME_BYTES = 64 * 1024 * 1024   # decoded size; anything bigger is a broken or hostile stream
+
+_RECORD = struct.Struct(">BH")
+_LEN = struct.Struct(">I")
+_TYPE_RE = re.compile(r'"type"\s*:\s*"([^"]+)"')
+_KEY_RE = re.compile(r'"(?:sport|game_id)"\s*:\s*"([^"]+)"')
+_ZLIB_WINDOW = 32 * 1024
+
+
+class FrameError(ValueError):
+    """A binary relay frame that can't be decoded."""
+
+
+def available_codecs() -> list[str]:
+    """Codecs usable here, best first."""
+    return (["zstd"] if zstandard is not None else []) + ["zlib"]
+
+
+def offer_subprotocols(codecs: list[str] | None = None) -> list[str]:
+    return [SUBPROTOCOL_PREFIX + c for c in (available_codecs() if codecs is None else codecs)]
+
+
+def choose_subprotocol(offered: list[str]) -> str | None:
+    """The first offered subprotocol whose codec is available here, or None for JSON text."""
+    have = available_codecs()
+    for proto in offered:
+        if proto.startswith(SUBPROTOCOL_PREFIX) and proto[len(SUBPROTOCOL_PREFIX):] in have:
+            return proto
+    return None
+
+
+def codec_for(subprotocol: str | None) -> str | None:
+    if subprotocol and subprotocol.startswith(SUBPROTOCOL_PREFIX):
+        return subprotocol[len(SUBPROTOCOL_PREFIX):]
+    return None
+
+
+def message_key(msg: str) -> str:
+    """``type:sport`` / ``type:game_id`` from the head of a message, or "" (e.g. heartbeats)."""
+    head = msg[:256]
+    m_type = _TYPE_RE.search(head)
+    m_key = _KEY_RE.search(head)
+    if m_type and m_key:
+        return f"{m_type.group(1)}:{m_key.group(1)}"
+    return ""
+
+
+class _Zlib:
+    def __init__(self, level: int | None):
+        self.level = 6 if level is None else level
+
+    def compress(self, data: bytes, ref: bytes | None) -> bytes:
+        if ref:
+            c = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS, 9,
+                                 zlib.Z_DEFAULT_STRATEGY, ref[-_ZLIB_WINDOW:])
+        else:
+            c = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return c.compress(data) + c.flush()
+
+    def decompress(self, data: bytes, ref: bytes | None, limit: int) -> bytes:
+        try:
+            if ref:
+                d = zlib.decompressobj(-zlib.MAX_WBITS, ref[-_ZLIB_WINDOW:])
+            else:
+                d = zlib.decompressobj(-zlib.MAX_WBITS)
+            out = d.decompress(data, limit)
+        except zlib.error as e:
+            raise FrameError(str(e)) from e
+        if d.unconsumed_tail:
+            raise FrameError(f"record decodes to more than {limit} bytes")
+        if not d.eof:
+            raise FrameError("truncated record payload")
+        return out
+
+
+class _Zstd:
+    def __init__(self, level: int | None):
+        self.level = 3 if level is None else level
+        self._plain_c = zstandard.ZstdCompressor(level=self.level)
+        self._plain_d = zstandard.ZstdDecompressor()
+
+    @staticmethod
+    def _dict(ref: bytes):
+        return zstandard.ZstdCompressionDict(ref, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+    def compress(self, data: bytes, ref: bytes | None) -> bytes:
+        c = zstandard.ZstdCompressor(level=self.level, dict_data=self._dict(ref)) if ref else self._plain_c
+        return c.compress(data)
+
+    def decompress(self, data: bytes, ref: bytes | None, limit: int) -> bytes:
+        try:
+            size = zstandard.frame_content_size(data)
+            if size < 0 or size > limit:
+                raise FrameError(f"record payload of unknown size or larger than {limit} bytes")
+            d = zstandard.ZstdDecompressor(dict_data=self._dict(ref)) if ref else self._plain_d
+            return d.decompress(data)
+        except zstandard.ZstdError as e:
+            raise FrameError(str(e)) from e
+
+
+def _make_codec(codec: str, level: int | None):
+    if codec == "zlib":
+        return _Zlib(level)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd relay codec needs the zstandard package")
+        return _Zstd(level)
+    raise ValueError(f"unknown relay codec {codec!r}")
+
+
+class _References:
+    """Previous message per key and per type.
+
+    Encoder and decoder apply the same operations in the same order, so they hold the same references.
+    """
+
+    def __init__(self, max_refs: int = MAX_REFS):
+        self.max_refs = max_refs
+        self._refs: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, key: str, flags: int) -> bytes | None:
+        if flags & FLAG_REF:
+            return self._refs.get(key)
+        if flags & FLAG_TYPE_REF:
+            return self._refs.get(key.partition(":")[0])
+        return None
+
+    def choose(self, key: str) -> tuple[int, bytes | None]:
+        """The best reference the other end also has for ``key``, and the flag naming it."""
+        if not key:
+            return 0, None
+        ref = self._refs.get(key)
+        if ref is not None:
+            return FLAG_REF, ref
+        ref = self._refs.get(key.partition(":")[0])
+        return (FLAG_TYPE_REF, ref) if ref is not None else (0, None)
+
+    def put(self, key: str, data: bytes):
+        if not key:
+            return
+        for k in (key, key.partition(":")[0]):
+            self._refs[k] = data
+            self._refs.move_to_end(k)
+        while len(self._refs) > self.max_refs:
+            self._refs.popitem(last=False)
+
+
+class BatchEncoder:
+    """Relay side: a list of JSON messages becomes one frame."""
+
+    def __init__(self, codec: str, level: int | None = None):
+        self.codec = codec
+        self._codec = _make_codec(codec, level)
+        self._refs = _References()
+        self.frames = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+
+    def encode(self, messages: list[str]) -> bytes:
+        parts = [bytes((VERSION,))]
+        raw = 0
+        for msg in messages:
+            data = msg.encode()
+            key = message_key(msg)
+            key_bytes = key.encode()
+            flags, ref = self._refs.choose(key)
+            payload = self._codec.compress(data, ref)
+            parts.append(_RECORD.pack(flags, len(key_bytes)))
+            parts.append(key_bytes)
+            parts.append(_LEN.pack(len(payload)))
+            parts.append(payload)
+            self._refs.put(key, data)
+            raw += len(data)
+        frame = b"".join(parts)
+        self.frames += 1
+        self.raw_bytes += raw
+        self.wire_bytes += len(frame)
+        return frame
+
+
+class BatchDecoder:
+    """Server side: one frame back into its JSON messages."""
+
+    def __init__(self, codec: str, max_frame_bytes: int = MAX_FRAME_BYTES):
+        self.codec = codec
+        self.max_frame_bytes = max_frame_bytes
+        self._codec = _make_codec(codec, None)
+        self._refs = _References()
+        self.frames = 0
+        self.messages = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+
+    def decode(self, frame: bytes) -> list[str]:
+        if not frame or frame[0] != VERSION:
+            raise FrameError(f"unsupported frame version {frame[0] if frame else None}")
+        messages = []
+        budget = self.max_frame_bytes
+        pos, end = 1, len(frame)
+        while pos < end:
+            if end - pos < _RECORD.size:
+                raise FrameError("truncated record header")
+            flags, key_len = _RECORD.unpack_from(frame, pos)
+            pos += _RECORD.size
+            if end - pos < key_len + _LEN.size:
+                raise FrameError("truncated record header")
+            key = frame[pos:pos + key_len].decode()
+            pos += key_len
+            (size,) = _LEN.unpack_from(frame, pos)
+            pos += _LEN.size
+            if end - pos < size:
+                raise FrameError("truncated record")
+            ref = self._refs.get(key, flags)
+            if ref is None and flags & (FLAG_REF | FLAG_TYPE_REF):
+                raise FrameError(f"no reference for {key!r}")
+            if budget <= 0:
+                # zlib reads a zero limit as "unlimited" and rejects a negative one
+                raise FrameError(f"frame decodes to more than {self.max_frame_bytes} bytes")
+            data = self._codec.decompress(frame[pos:pos + size], ref, budget)
+            pos += size
+            budget -= len(data)
+            self._refs.put(key, data)
+            try:
+                messages.append(data.decode())
+            except UnicodeDecodeError as e:
+                raise FrameError(str(e)) from e
+        self.frames += 1
+        self.messages += len(messages)
+        self.raw_bytes += self.max_frame_bytes - budget
+        self.wire_bytes += end
+        return messages
+
+    def stats(self) -> dict:
+        return {
+            "codec": self.codec,
+            "frames": self.frames,
+            "messages": self.messages,
+            "wire_bytes": self.wire_bytes,
+            "raw_bytes": self.raw_bytes,
+            "ratio": round(self.raw_bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+        }
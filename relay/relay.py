@@ -15,12 +15,17 @@ import asyncio
 import json
 import logging
 import os
+import sqlite3
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from codec import BatchEncoder, codec_for, offer_subprotocols  # relay/codec.py, shared with the server
+
 load_dotenv()
 
 # ── Configuration ─────────────────────────────────────────────────
@@ -33,6 +38,8 @@ SR_TIER = os.getenv("SR_TIER", "trial")
 SR_SPORTS = os.getenv("SR_SPORTS", "nba,ncaamb").split(",")
 
 POLL_INTERVAL = 1.0  # seconds between DB checks
+CHANGE_QUEUE_SIZE = 4  # ticks of change records read ahead of the socket
+FULL_CHECK_INTERVAL = 30.0  # re-read everything at least this often, whatever the DB signals say
 HEARTBEAT_INTERVAL = 30.0  # seconds between heartbeats
 RECONNECT_DELAY = 5.0  # seconds before reconnect attempt
 
@@ -52,24 +59,129 @@ from client.db_reader import DBReader  # noqa: E402
 DB_PATH = str(SCANNER_ROOT / "scanner.db")
 reader = DBReader(DB_PATH, cache_ttl_ms=200, stale_threshold_ms=30_000)
 
+# Everything that touches the scanner DB (DBReader, DBChangeSignal, the
+# ChangeTracker's diffing) runs on this one thread. The event loop stays free
+# for pings and PBP requests, and DBReader is never used concurrently.
+_db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scanner-db")
+# Frame encoding (compression) runs on its own thread, one frame at a time, in order
+_codec_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="relay-codec")
+
+
+async def _in_thread(executor: ThreadPoolExecutor, fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
 
 # ── Change tracker ────────────────────────────────────────────────
 
+class DBChangeSignal:
+    """One cheap query per tick: has anything committed to the scanner DB?
+
+    Uses SQLite's ``PRAGMA data_version`` on a private read-only connection —
+    it changes whenever another connection commits. Reports a change for one
+    extra tick so reads that hit ``DBReader``'s short-lived cache get a
+    second, fresh look. Reopens if the DB file is replaced, and reports
+    "changed" whenever it can't tell.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._inode: int | None = None
+        self._version: int | None = None
+        self._recheck = False
+
+    def _connect(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        self._inode = os.stat(self.path).st_ino
+        self._version = None
+
+    def changed(self) -> bool:
+        try:
+            if self._conn is None or os.stat(self.path).st_ino != self._inode:
+                self._connect()
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except (OSError, sqlite3.Error) as e:
+            log.debug("data_version unavailable (%s) — treating as changed", e)
+            self._conn = None
+            return True
+        if version != self._version:
+            self._version = version
+            self._recheck = True
+            return True
+        if self._recheck:
+            self._recheck = False
+            return True
+        return False
+
+
 class ChangeTracker:
-    """Tracks content hashes / timestamps to detect actual changes in scanner DB."""
+    """Tracks schedule contents / summary timestamps to detect actual changes in scanner DB.
+
+    Schedules are kept per game, so a change to one game is pushed as a
+    ``schedule_patch`` with just that game. Each sport's schedule carries a
+    revision; a patch names the revision it applies on top of (``base_rev``),
+    and the server asks for a full schedule if that isn't what it holds.
+    """
 
     def __init__(self):
-        self._schedule_hash: dict[str, int] = {}  # sport -> hash of schedule JSON
+        self._schedules: dict[str, dict] = {}     # sport -> last schedule pushed
+        self._games: dict[str, dict[str, dict]] = {}  # sport -> game_id -> last game entry pushed
+        self._revs: dict[str, int] = {}           # sport -> revision of the last push
         self._summary_ts: dict[str, float] = {}   # game_id -> last updated_at
-
-    def check_schedule(self, sport: str, data: dict) -> bool:
-        """Returns True if schedule content has changed since last check."""
-        h = hash(json.dumps(data, sort_keys=True))
-        prev = self._schedule_hash.get(sport)
-        if prev != h:
-            self._schedule_hash[sport] = h
-            return True
-        return False
+        self.resync = False                       # a sport was forgotten; re-read without waiting for the DB
+
+    def reset(self):
+        """Forget what was pushed, so everything goes out again (e.g. after a reconnect).
+
+        Every sport's schedule is sent in full, and so is every live summary.
+        """
+        self._schedules.clear()
+        self._games.clear()
+        self._summary_ts.clear()
+
+    def forget_schedule(self, sport: str):
+        self._schedules.pop(sport, None)
+        self._games.pop(sport, None)
+        self.resync = True
+
+    def diff_schedule(self, sport: str, data: dict) -> dict | None:
+        """The message that brings the server up to ``data``, or None if nothing changed.
+
+        A structural compare against the last pushed schedule: no serializing,
+        and it stops at the first difference. Falls back to a full ``schedule``
+        message when there's no base, anything outside ``games`` changed, a
+        game has no id, or the surviving games were reordered.
+        """
+        prev = self._schedules.get(sport)
+        if prev is data or prev == data:
+            return None
+        rev = self._revs.get(sport, 0) + 1
+        self._revs[sport] = rev
+        self._schedules[sport] = data
+
+        games = data.get("games", [])
+        by_id = {g.get("id"): g for g in games}
+        prev_games = self._games.get(sport)
+        self._games[sport] = by_id
+        if (prev_games is None or "" in by_id or None in by_id or len(by_id) != len(games)
+                or {k: v for k, v in prev.items() if k != "games"}
+                != {k: v for k, v in data.items() if k != "games"}):
+            return {"type": "schedule", "sport": sport, "rev": rev, "data": data}
+
+        kept = [gid for gid in by_id if gid in prev_games]
+        if kept != [gid for gid in prev_games if gid in by_id]:
+            return {"type": "schedule", "sport": sport, "rev": rev, "data": data}
+
+        return {
+            "type": "schedule_patch",
+            "sport": sport,
+            "base_rev": rev - 1,
+            "rev": rev,
+            "games": [g for gid, g in by_id.items() if prev_games.get(gid) != g],
+            "removed": [gid for gid in prev_games if gid not in by_id],
+        }
 
     def check_summary(self, game_id: str, updated_at: float) -> bool:
         """Returns True if summary has changed since last check."""
@@ -80,14 +192,47 @@ class ChangeTracker:
         return False
 
 
+# ── Server link ───────────────────────────────────────────────────
+
+class RelaySender:
+    """Outgoing messages to the server.
+
+    If a codec was negotiated at connect time, messages are buffered and
+    ``flush`` sends them as one compressed binary frame (see ``codec.py``).
+    Otherwise every message goes straight out as its own JSON text frame.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        codec = codec_for(ws.subprotocol)
+        self.encoder = BatchEncoder(codec) if codec else None
+        self._pending: list[str] = []
+        # The compression stream must reach the server in encode order
+        self._lock = asyncio.Lock()
+
+    async def send(self, msg: str):
+        if self.encoder is None:
+            await self.ws.send(msg)
+        else:
+            self._pending.append(msg)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        async with self._lock:
+            frame = await _in_thread(_codec_thread, self.encoder.encode, batch)
+            await self.ws.send(frame)
+
+
 # ── PBP fetcher ───────────────────────────────────────────────────
 
 def _base_url(sport: str) -> str:
     return f"https://api.sportradar.com/{sport}/{SR_TIER}/v8/en"
 
 
-async def fetch_pbp(game_id: str, sport: str) -> dict | None:
-    """Fetch PBP from SportRadar API."""
+async def fetch_pbp(game_id: str, sport: str) -> str | None:
+    """Fetch PBP from SportRadar API. Returns the raw JSON body."""
     import httpx
 
     base = _base_url(sport)
@@ -96,7 +241,7 @@ async def fetch_pbp(game_id: str, sport: str) -> dict | None:
         async with httpx.AsyncClient(timeout=15.0) as client:
             resp = await client.get(url, params={"api_key": SPORTRADAR_API_KEY})
             if resp.status_code == 200:
-                return resp.json()
+                return resp.text
             elif resp.status_code == 429:
                 log.warning("PBP 429 rate limited — backing off 60s")
                 await asyncio.sleep(60)
@@ -107,16 +252,40 @@ async def fetch_pbp(game_id: str, sport: str) -> dict | None:
     return None
 
 
+# game_id -> sport, refreshed from every schedule read in _poll_and_push
+_game_sports: dict[str, str] = {}
+
+
+def index_schedule(sport: str, data: dict):
+    for game in data.get("games", []):
+        game_id = game.get("id", "")
+        if game_id:
+            _game_sports[game_id] = sport
+
+
 def find_sport_for_game(game_id: str) -> str | None:
-    """Look up which sport a game belongs to by checking schedules."""
+    """Look up which sport a game belongs to (index first, DB only on a miss)."""
+    sport = _game_sports.get(game_id)
+    if sport:
+        return sport
     for sport in SR_SPORTS:
+        sport = sport.strip()
         data = reader.get_sportradar_schedule(sport)
-        if not data:
-            continue
-        for game in data.get("games", []):
-            if game.get("id") == game_id:
-                return sport
-    return None
+        if data:
+            index_schedule(sport, data)
+    return _game_sports.get(game_id)
+
+
+def _timestamp(value) -> float:
+    """``updated_at`` as epoch seconds (the DB may hand back a float, datetime or ISO string)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time()  # unparseable: treat as changed
 
 
 # ── Main relay ────────────────────────────────────────────────────
@@ -127,93 +296,161 @@ async def run_relay():
 
     tracker = ChangeTracker()
     pbp_queue: asyncio.Queue = asyncio.Queue()
+    lag_task = asyncio.create_task(_watch_loop_lag())
 
     while True:
         url = f"{RELAY_URL}?secret={RELAY_SECRET}"
         log.info("Connecting to %s ...", RELAY_URL)
 
         try:
-            async with websockets.connect(url, ping_interval=20, ping_timeout=10) as ws:
-                log.info("Connected to Railway relay endpoint")
-
-                # Run three concurrent tasks
-                await asyncio.gather(
-                    _poll_and_push(ws, tracker),
-                    _listen_for_server_messages(ws, pbp_queue),
-                    _process_pbp_queue(ws, pbp_queue),
-                )
+            # Offer batched binary frames; they're compressed already, so no permessage-deflate
+            async with websockets.connect(url, ping_interval=20, ping_timeout=10,
+                                          subprotocols=offer_subprotocols(), compression=None) as ws:
+                sender = RelaySender(ws)
+                log.info("Connected to Railway relay endpoint (%s)",
+                         f"{sender.encoder.codec} batches" if sender.encoder else "JSON text")
+                # The server may have restarted — start from full schedules and summaries
+                await _in_thread(_db_thread, tracker.reset)
+                changes: asyncio.Queue = asyncio.Queue(maxsize=CHANGE_QUEUE_SIZE)
+
+                # Run four concurrent tasks; if one fails, stop the rest before reconnecting
+                tasks = [
+                    asyncio.create_task(_read_changes(tracker, changes)),
+                    asyncio.create_task(_poll_and_push(sender, changes)),
+                    asyncio.create_task(_listen_for_server_messages(ws, pbp_queue, tracker)),
+                    asyncio.create_task(_process_pbp_queue(sender, pbp_queue)),
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
 
         except asyncio.CancelledError:
             log.info("Relay shutting down")
+            lag_task.cancel()
             return
         except Exception as e:
             log.warning("Relay connection lost: %s — reconnecting in %ds", e, int(RECONNECT_DELAY))
             await asyncio.sleep(RECONNECT_DELAY)
 
 
-async def _poll_and_push(ws, tracker: ChangeTracker):
-    """Poll scanner DB every 1s and push changes to Railway."""
+async def _watch_loop_lag(interval: float = 0.1):
+    """Log the event loop's worst scheduling delay once per heartbeat interval.
+
+    This bounds how long a ping or PBP request can wait to be handled.
+    """
+    worst = 0.0
+    since = time.monotonic()
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        worst = max(worst, now - start - interval)
+        if now - since >= HEARTBEAT_INTERVAL:
+            log.log(logging.WARNING if worst > 0.05 else logging.INFO,
+                    "Event loop lag: max %.1f ms over %ds", worst * 1000, int(now - since))
+            worst = 0.0
+            since = now
+
+
+async def _read_changes(tracker: ChangeTracker, changes: asyncio.Queue):
+    """Every POLL_INTERVAL, read the scanner DB on the DB thread and queue what changed.
+
+    Schedules and live summaries are only read on ticks where the DB
+    reports a commit (or every FULL_CHECK_INTERVAL as a safety net). Each
+    queued item is one tick's worth of messages.
+    """
+    last_full_check = 0.0
+    signal = DBChangeSignal(DB_PATH)
+
+    while True:
+        force = tracker.resync or time.time() - last_full_check >= FULL_CHECK_INTERVAL
+        tracker.resync = False
+        msgs = await _in_thread(_db_thread, _collect_changes, tracker, signal, force)
+        if msgs is not None:
+            last_full_check = time.time()
+            if msgs:
+                await changes.put(msgs)
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def _poll_and_push(sender: RelaySender, changes: asyncio.Queue):
+    """Push each tick of change records to Railway, with heartbeats in between."""
     last_heartbeat = time.time()
 
     while True:
         try:
-            # Check schedules for changes
-            for sport in SR_SPORTS:
-                sport = sport.strip()
-                data = reader.get_sportradar_schedule(sport)
-                if not data:
-                    continue
-
-                if tracker.check_schedule(sport, data):
-                    await ws.send(json.dumps({
-                        "type": "schedule",
-                        "sport": sport,
-                        "data": data,
-                    }))
-                    log.debug("Pushed schedule update for %s", sport)
-
-                # Check summaries for live games
-                for game in data.get("games", []):
-                    status = game.get("status", "")
-                    game_id = game.get("id", "")
-                    if not game_id:
-                        continue
-
-                    # Only actively push summaries for live/halftime games
-                    if status not in ("inprogress", "halftime"):
-                        continue
-
-                    game_obj = reader.get_sportradar_game(game_id)
-                    if not game_obj or game_obj.game_data_json == "{}":
-                        continue
-
-                    # Use the model's updated_at for change detection
-                    updated = game_obj.updated_at if hasattr(game_obj, 'updated_at') else 0.0
-                    if isinstance(updated, str):
-                        updated = time.time()  # fallback if string
-
-                    if tracker.check_summary(game_id, updated):
-                        await ws.send(json.dumps({
-                            "type": "summary",
-                            "game_id": game_id,
-                            "data": json.loads(game_obj.game_data_json),
-                        }))
-                        log.debug("Pushed summary update for %s", game_id)
+            timeout = max(0.0, last_heartbeat + HEARTBEAT_INTERVAL - time.time())
+            try:
+                msgs = await asyncio.wait_for(changes.get(), timeout)
+            except asyncio.TimeoutError:
+                msgs = []
+            for msg in msgs:
+                await sender.send(msg)
 
             # Heartbeat
             if time.time() - last_heartbeat >= HEARTBEAT_INTERVAL:
-                await ws.send(json.dumps({"type": "heartbeat"}))
+                await sender.send(json.dumps({"type": "heartbeat"}))
                 last_heartbeat = time.time()
 
+            # Everything from this tick goes out as one frame
+            await sender.flush()
+
         except Exception as e:
-            log.warning("Poll loop error: %s", e)
+            log.warning("Push loop error: %s", e)
             raise  # Let the outer loop handle reconnection
 
-        await asyncio.sleep(POLL_INTERVAL)
+
+def _collect_changes(tracker: ChangeTracker, signal: DBChangeSignal, force: bool) -> list[str] | None:
+    """Read schedules + live summaries and return the messages for whatever changed.
+
+    Runs on the DB thread. Returns None when the DB reported no commit and
+    ``force`` is off, so nothing was read.
+    """
+    if not signal.changed() and not force:
+        return None
+    msgs: list[str] = []
+    for sport in SR_SPORTS:
+        sport = sport.strip()
+        data = reader.get_sportradar_schedule(sport)
+        if not data:
+            continue
+
+        msg = tracker.diff_schedule(sport, data)
+        if msg is not None:
+            index_schedule(sport, data)
+            msgs.append(json.dumps(msg))
+            log.debug("Queued %s for %s (rev %d)", msg["type"], sport, msg["rev"])
+
+        # Check summaries for live games
+        for game in data.get("games", []):
+            status = game.get("status", "")
+            game_id = game.get("id", "")
+            if not game_id:
+                continue
+
+            # Only actively push summaries for live/halftime games
+            if status not in ("inprogress", "halftime"):
+                continue
+
+            game_obj = reader.get_sportradar_game(game_id)
+            if not game_obj or game_obj.game_data_json == "{}":
+                continue
+
+            # Use the model's updated_at for change detection
+            if tracker.check_summary(game_id, _timestamp(getattr(game_obj, "updated_at", 0.0))):
+                # The row already holds JSON — splice it in rather than parse + re-encode
+                msgs.append(
+                    f'{{"type":"summary","game_id":{json.dumps(game_id)},"data":{game_obj.game_data_json}}}'
+                )
+                log.debug("Queued summary update for %s", game_id)
+    return msgs
 
 
-async def _listen_for_server_messages(ws, pbp_queue: asyncio.Queue):
-    """Listen for messages from Railway (e.g., PBP requests)."""
+async def _listen_for_server_messages(ws, pbp_queue: asyncio.Queue, tracker: ChangeTracker):
+    """Listen for messages from Railway (PBP requests, full-schedule resyncs)."""
     try:
         async for raw in ws:
             try:
@@ -227,12 +464,19 @@ async def _listen_for_server_messages(ws, pbp_queue: asyncio.Queue):
                     await pbp_queue.put(game_id)
                     log.info("PBP requested for %s", game_id)
 
+            elif msg.get("type") == "request_schedule":
+                # The server missed a patch; the next tick sends this sport in full
+                sport = msg.get("sport", "")
+                if sport:
+                    _db_thread.submit(tracker.forget_schedule, sport)
+                    log.info("Full schedule requested for %s", sport)
+
     except Exception as e:
         log.warning("Server listener error: %s", e)
         raise
 
 
-async def _process_pbp_queue(ws, pbp_queue: asyncio.Queue):
+async def _process_pbp_queue(sender: RelaySender, pbp_queue: asyncio.Queue):
     """Process PBP requests — fetch from SR API and push to Railway."""
     last_request = 0.0
 
@@ -244,7 +488,7 @@ async def _process_pbp_queue(ws, pbp_queue: asyncio.Queue):
         if elapsed < 1.0:
             await asyncio.sleep(1.0 - elapsed)
 
-        sport = find_sport_for_game(game_id)
+        sport = _game_sports.get(game_id) or await _in_thread(_db_thread, find_sport_for_game, game_id)
         if not sport:
             log.warning("Could not find sport for game %s", game_id)
             continue
@@ -253,12 +497,11 @@ async def _process_pbp_queue(ws, pbp_queue: asyncio.Queue):
         last_request = time.time()
 
         if data:
-            await ws.send(json.dumps({
-                "type": "pbp",
-                "game_id": game_id,
-                "data": data,
-            }))
-            log.info("Pushed PBP for %s (%d bytes)", game_id, len(json.dumps(data)))
+            # Spliced like summaries: the body is never parsed here
+            msg = f'{{"type":"pbp","game_id":{json.dumps(game_id)},"data":{data}}}'
+            await sender.send(msg)
+            await sender.flush()
+            log.info("Pushed PBP for %s (%d bytes)", game_id, len(msg))
 
 
 # ── Entry point ───────────────────────────────────────────────────
@@ -274,5 +517,9 @@ if __name__ == "__main__":
         log.error("Scanner DB not found at %s", DB_PATH)
         sys.exit(1)
 
+    # The DB and codec threads hold the GIL for JSON work; hand it back to the
+    # event loop every 1 ms instead of 5 so pings and PBP requests aren't kept waiting
+    sys.setswitchinterval(0.001)
+
     log.info("Starting relay — DB=%s → %s", DB_PATH, RELAY_URL)
     asyncio.run(run_relay())